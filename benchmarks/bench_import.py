@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Package import benchmark, using the interpreter's own import timings (python3 -X importtime)
+# Each case runs in a fresh interpreter. The time of a case is the cumulative time of every lilvlib module it
+# imported, including their dependencies.
+# Results are printed as one JSON object per line:
+#   { "case", "time" (best of N, milliseconds), "modules" (imported by the case), "lilv" (true if lilv was loaded) }
+# Cases that need lilv report "error" instead when it is not installed.
+# With --check the exit code is 1 if any of the pure python cases loaded lilv.
+# Usage: bench_import.py [--repeat N] [--check]
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOTDIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# ------------------------------------------------------------------------------------------------------------
+# Cases, as (name, code, needs lilv)
+
+CASES = (
+    ("package",  "import lilvlib", False),
+    ("helpers",  "from lilvlib import get_short_port_name, get_port_unit", False),
+    ("category", "from lilvlib import CATEGORIES, CategoryIndex, get_categories", False),
+    ("cache",    "from lilvlib import PluginInfoCache, CatalogSnapshot, PluginDatabase", False),
+    ("client",   "from lilvlib import LilvClient", False),
+    ("world",    "from lilvlib import WorldManager", True),
+    ("all",      "import lilvlib; [getattr(lilvlib, name) for name in lilvlib.__all__]", True),
+)
+
+# ------------------------------------------------------------------------------------------------------------
+
+# Run @a code in a new interpreter, returns (milliseconds, modules, lilv loaded)
+def measure(code):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([ROOTDIR] + [path for path in env.get('PYTHONPATH', "").split(os.pathsep)
+                                                     if path])
+
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+
+    if proc.returncode != 0:
+        raise Exception(proc.stderr.strip().splitlines()[-1])
+
+    # lines look like "import time:   self [us] | cumulative | <indent>module", nested imports are indented and
+    # printed before the module that imported them. Lazily loaded lilvlib modules show up at the top level.
+    took    = 0
+    modules = 0
+    lilv    = False
+    nested  = 0
+
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        selftime, cumulative, name = line[len("import time:"):].split("|", 2)
+        toplevel = not name[1:].startswith(" ")
+        name     = name.strip()
+
+        if name == "lilv":
+            lilv = True
+
+        if not toplevel:
+            nested += 1
+            continue
+
+        if name == "lilvlib" or name.startswith("lilvlib."):
+            took    += int(cumulative)
+            modules += nested + 1
+
+        nested = 0
+
+    return (took / 1000.0, modules, lilv)
+
+def run(name, code, repeat):
+    best = None
+
+    for i in range(repeat):
+        took, modules, lilv = measure(code)
+
+        if best is None or took < best:
+            best = took
+
+    return {
+        'case'   : name,
+        'time'   : best,
+        'modules': modules,
+        'lilv'   : lilv,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="lilvlib import time benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="fail if a pure python case loads lilv")
+    args = parser.parse_args()
+
+    failed = []
+
+    for name, code, needslilv in CASES:
+        try:
+            result = run(name, code, args.repeat)
+        except Exception as e:
+            if not needslilv:
+                raise
+            result = { 'case': name, 'error': str(e) }
+
+        if result.get('lilv', False) and not needslilv:
+            failed.append(name)
+
+        print(json.dumps(result))
+        sys.stdout.flush()
+
+    if args.check and len(failed) != 0:
+        sys.stderr.write("lilv was loaded by: %s\n" % ", ".join(failed))
+        return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Catalog memory benchmark, regular plugin info dicts against compact_plugin_info, measured with tracemalloc
+# By default the plugin info is generated directly (no lilv needed), use --scan to scan synthetic bundles instead.
+# Generated info goes through a JSON round trip first, so repeated strings are separate objects as in real scans.
+# Results are printed as one JSON object per line:
+#   { "plugins", "ports" (in total), "dict-size", "compact-size" (bytes, shared strings included),
+#     "saved" (fraction of dict-size), "compact-time", "expand-time" (seconds) }
+# Usage: bench_memory.py [--plugins N ...] [--ports N] [--scan]
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_snapshot import get_infos
+
+from lilvlib.compact import StringPool, compact_plugin_info, expand_plugin_info
+
+# ------------------------------------------------------------------------------------------------------------
+
+def get_traced_size():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def run(count, ports, scan):
+    tmpdir = tempfile.mkdtemp(prefix="lilvlib-bench-")
+
+    try:
+        data = json.dumps(get_infos(count, ports, scan, tmpdir))
+    finally:
+        shutil.rmtree(tmpdir)
+
+    tracemalloc.start()
+
+    try:
+        base  = get_traced_size()
+        infos = json.loads(data)
+        dictsize = get_traced_size() - base
+
+        start    = time.perf_counter()
+        pool     = StringPool()
+        compacts = [compact_plugin_info(info, pool) for info in infos]
+        compacttime = time.perf_counter() - start
+
+        del infos
+        compactsize = get_traced_size() - base
+
+        start    = time.perf_counter()
+        expanded = [expand_plugin_info(compact) for compact in compacts]
+        expandtime = time.perf_counter() - start
+
+    finally:
+        tracemalloc.stop()
+
+    if expanded != json.loads(data):
+        raise Exception("expanded data does not match")
+
+    return {
+        'plugins'     : count,
+        'ports'       : sum(len(ports) for info in compacts for dirs in info['ports'].values()
+                            for ports in dirs.values()),
+        'dict-size'   : dictsize,
+        'compact-size': compactsize,
+        'saved'       : 1.0 - float(compactsize) / dictsize,
+        'compact-time': compacttime,
+        'expand-time' : expandtime,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="lilvlib compact catalog memory benchmark")
+    parser.add_argument("--plugins", type=int, nargs="*", default=[100, 1000, 5000])
+    parser.add_argument("--ports", type=int, default=16)
+    parser.add_argument("--scan", action="store_true", help="scan synthetic bundles with lilv")
+    args = parser.parse_args()
+
+    for count in args.plugins:
+        print(json.dumps(run(count, args.ports, args.scan)))
+        sys.stdout.flush()
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
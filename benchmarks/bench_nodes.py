@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Node creation micro-benchmark
+# Compares building fresh NS objects for every scan (as get_plugin_info used to do) with the world-scoped
+# namespace registry, then counts the nodes created (registry misses) by real scans over synthetic plugins.
+# Results are printed as one JSON object per line:
+#   { "case": "fresh" | "registry", "scans", "wall" (best of N, seconds), "per-scan" (microseconds) }
+#   { "case": "scan", "plugins", "new_uri", "new_uri-per-plugin", "new_uri-rescan", "queries-per-plugin" }
+# "new_uri" are the nodes created by the first scan of a world, "new_uri-rescan" those of a second scan.
+# The scan fails if the instrument recorded no lilv queries at all.
+# Usage: bench_nodes.py [--repeat N] [--scans N] [--plugins N]
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import synth
+
+# ------------------------------------------------------------------------------------------------------------
+# Nodes used by a single plugin scan, as namespace -> names
+
+SCAN_NODES = {
+    "http://usefulinc.com/ns/doap#": ["name", "license", "maintainer"],
+    "http://xmlns.com/foaf/0.1/": ["name", "homepage", "mbox"],
+    "http://www.w3.org/2000/01/rdf-schema#": ["comment", "label"],
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#": ["type_"],
+    "http://lv2plug.in/ns/lv2core#": ["binary", "minorVersion", "microVersion", "prototype"],
+    "http://moddevices.com/ns/mod#": ["brand", "label"],
+    "http://moddevices.com/ns/modgui#": ["gui", "resourcesDirectory", "iconTemplate", "settingsTemplate",
+                                         "javascript", "stylesheet", "screenshot", "thumbnail", "brand",
+                                         "label", "model", "panel", "color", "knob", "port"],
+    "http://lv2plug.in/ns/extensions/units#": ["render", "symbol"],
+    "http://lv2plug.in/ns/ext/presets#": ["Preset"],
+}
+
+# ------------------------------------------------------------------------------------------------------------
+
+def timeit(func, repeat):
+    best = None
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        took  = time.perf_counter() - start
+
+        if best is None or took < best:
+            best = took
+
+    return best
+
+def run_micro(scans, repeat):
+    import lilv
+    from lilvlib import NS, get_world_ns
+
+    world = lilv.World()
+
+    def fresh():
+        for i in range(scans):
+            for base, names in SCAN_NODES.items():
+                ns = NS(world, base)
+                for name in names:
+                    getattr(ns, name)
+
+    def registry():
+        for i in range(scans):
+            for base, names in SCAN_NODES.items():
+                ns = get_world_ns(world, base)
+                for name in names:
+                    getattr(ns, name)
+
+    results = []
+
+    for case, func in (("fresh", fresh), ("registry", registry)):
+        wall = timeit(func, repeat)
+        results.append({ 'case': case, 'scans': scans, 'wall': wall, 'per-scan': wall * 1000000.0 / scans })
+
+    return results
+
+def run_scan(plugins):
+    import lilvlib
+
+    tmpdir = tempfile.mkdtemp(prefix="lilvlib-bench-")
+
+    try:
+        bundles    = synth.make_plugin_bundles(tmpdir, plugins, ports=8, presets=2, modgui=True)
+        manager    = lilvlib.WorldManager()
+        instrument = lilvlib.ScanInstrument()
+        lilvlib.get_plugins_info(bundles, manager=manager, instrument=instrument)
+        newuri = lilvlib.get_world_node_count(manager.world)
+
+        # same plugins again in the same world, the registry should need no new nodes
+        lilvlib.get_plugins_info(bundles, manager=manager)
+        rescan = lilvlib.get_world_node_count(manager.world) - newuri
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+    queries = sum(phase['queries'] for record in instrument.records.values() for phase in record['phases'].values())
+
+    # every plugin queries lilv, so this means the instrument does not see the calls
+    if queries == 0:
+        raise Exception("instrumented scan recorded no lilv queries")
+
+    return {
+        'case'              : 'scan',
+        'plugins'           : plugins,
+        'new_uri'           : newuri,
+        'new_uri-per-plugin': float(newuri) / plugins,
+        'new_uri-rescan'    : rescan,
+        'queries-per-plugin': float(queries) / plugins,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="lilvlib node creation micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scans", type=int, default=1000)
+    parser.add_argument("--plugins", type=int, default=50)
+    args = parser.parse_args()
+
+    for result in run_micro(args.scans, args.repeat):
+        print(json.dumps(result))
+
+    print(json.dumps(run_scan(args.plugins)))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
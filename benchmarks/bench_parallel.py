@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Compare serial and parallel get_plugins_info for increasing bundle counts
+# Usage: bench_parallel.py [--jobs N] [--repeat N] [--synthetic N] [bundle-or-lv2-dir...]
+# Without arguments the bundles in LV2_PATH are used, --synthetic generates N plugin bundles instead. Results are printed as one JSON object per line.
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import synth
+
+from lilvlib import get_lv2_bundles, get_plugins_info
+
+# ------------------------------------------------------------------------------------------------------------
+
+def get_bundles(paths):
+    if len(paths) == 0:
+        return get_lv2_bundles()
+
+    bundles = []
+    for path in paths:
+        if os.path.exists(os.path.join(path, "manifest.ttl")):
+            bundles.append(path)
+        else:
+            bundles += get_lv2_bundles([path])
+    return bundles
+
+def timeit(func, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        took = time.perf_counter() - start
+        if best is None or took < best:
+            best = took
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="get_plugins_info serial vs parallel benchmark")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--synthetic", type=int, default=0)
+    parser.add_argument("paths", nargs="*")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        tmpdir  = tempfile.mkdtemp(prefix="lilvlib-bench-")
+        bundles = synth.make_plugin_bundles(tmpdir, args.synthetic, ports=16, presets=4, modgui=True)
+        try:
+            return run(bundles, args)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    return run(get_bundles(args.paths), args)
+
+def run(bundles, args):
+    if len(bundles) == 0:
+        print("no bundles found", file=sys.stderr)
+        return 1
+
+    count = 1
+    while True:
+        count  = min(count, len(bundles))
+        subset = bundles[:count]
+
+        try:
+            serial   = timeit(lambda: get_plugins_info(subset), args.repeat)
+            parallel = timeit(lambda: get_plugins_info(subset, jobs=args.jobs), args.repeat)
+        except Exception as e:
+            # subsets without plugins, like spec-only bundles
+            serial = parallel = None
+            print(json.dumps({ 'bundles': count, 'error': str(e) }))
+
+        if serial is not None:
+            print(json.dumps({
+                'bundles' : count,
+                'jobs'    : args.jobs,
+                'serial'  : serial,
+                'parallel': parallel,
+                'speedup' : serial / parallel if parallel else 0.0,
+            }))
+            sys.stdout.flush()
+
+        if count == len(bundles):
+            break
+        count *= 2
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Scan benchmarks over synthetic bundles
+# Times get_plugins_info (with and without validation), get_plugin_info, get_pedalboard_info and
+# get_pedalboard_name while varying one
+# parameter of the generated bundles at a time (plugin count, ports, scale points, presets, modgui,
+# pedalboard blocks and arcs).
+# Each case runs in its own process, results are printed as one JSON object per line:
+#   { "function", "param", "value", "wall" (best of N, seconds), "peak" (tracemalloc bytes), "maxrss" (KiB) }
+# Usage: bench_scan.py [--repeat N] [--quick] [--only function]
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import synth
+
+# ------------------------------------------------------------------------------------------------------------
+# Cases
+
+# parameter -> values to try, everything else uses the defaults below
+PLUGIN_DEFAULTS = { 'plugins': 10, 'ports': 8, 'scalepoints': 0, 'presets': 0, 'modgui': False }
+
+PLUGIN_SWEEPS = [
+    ('plugins',     [1, 10, 50, 200]),
+    ('ports',       [2, 16, 64, 256]),
+    ('scalepoints', [0, 8, 32, 128]),
+    ('presets',     [0, 10, 50, 200]),
+    ('modgui',      [False, True]),
+]
+
+PEDALBOARD_SWEEPS = [
+    ('blocks', [1, 10, 50, 200]),
+    ('arcs',   [0, 10, 50, 200]),
+]
+
+QUICK_SWEEPS = {
+    'plugins'    : [1, 10],
+    'ports'      : [2, 16],
+    'scalepoints': [0, 8],
+    'presets'    : [0, 10],
+    'modgui'     : [False, True],
+    'blocks'     : [1, 10],
+    'arcs'       : [0, 10],
+}
+
+# ------------------------------------------------------------------------------------------------------------
+# Measurement
+
+def measure(func, repeat):
+    best = None
+    peak = 0
+
+    for i in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        took  = time.perf_counter() - start
+        peak  = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        if best is None or took < best:
+            best = took
+
+    return {
+        'wall'  : best,
+        'peak'  : peak,
+        'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+def run_case(function, param, value, repeat):
+    import lilvlib
+
+    tmpdir = tempfile.mkdtemp(prefix="lilvlib-bench-")
+
+    try:
+        if function in ("get_plugins_info", "get_plugins_info_fast", "get_plugin_info"):
+            kwargs = dict(PLUGIN_DEFAULTS)
+            kwargs[param] = value
+            count = kwargs.pop('plugins')
+
+            if function == "get_plugin_info":
+                count = 1
+
+            bundles = synth.make_plugin_bundles(tmpdir, count, **kwargs)
+
+            if function == "get_plugins_info":
+                func = lambda: lilvlib.get_plugins_info(bundles)
+
+            elif function == "get_plugins_info_fast":
+                func = lambda: lilvlib.get_plugins_info(bundles, validate=False)
+
+            else:
+                manager = lilvlib.WorldManager()
+                manager.load_bundle(bundles[0])
+                plugin = manager.get_plugins(bundles)[0]
+                func   = lambda: lilvlib.get_plugin_info(manager.world, plugin, False)
+
+        else:
+            kwargs = { 'blocks': 4, 'arcs': None }
+            kwargs[param] = value
+            bundle = synth.make_pedalboard_bundle(tmpdir, "pedalboard", **kwargs)
+            func   = lambda: getattr(lilvlib, function)(bundle)
+
+        result = measure(func, repeat)
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+    result.update({ 'function': function, 'param': param, 'value': value })
+    return result
+
+def _run_case_process(queue, args):
+    try:
+        queue.put(run_case(*args))
+    except Exception as e:
+        queue.put({ 'function': args[0], 'param': args[1], 'value': args[2], 'error': str(e) })
+
+# run a case in a new process, so memory numbers are not affected by the previous ones
+def run_case_isolated(function, param, value, repeat):
+    queue   = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_case_process, args=(queue, (function, param, value, repeat)))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+# ------------------------------------------------------------------------------------------------------------
+
+def get_cases(quick):
+    cases = []
+
+    for function in ("get_plugins_info", "get_plugins_info_fast", "get_plugin_info"):
+        for param, values in PLUGIN_SWEEPS:
+            if function == "get_plugin_info" and param == "plugins":
+                continue
+            for value in (QUICK_SWEEPS[param] if quick else values):
+                cases.append((function, param, value))
+
+    for function in ("get_pedalboard_info", "get_pedalboard_name"):
+        for param, values in PEDALBOARD_SWEEPS:
+            for value in (QUICK_SWEEPS[param] if quick else values):
+                cases.append((function, param, value))
+
+    return cases
+
+def main():
+    parser = argparse.ArgumentParser(description="lilvlib scan benchmarks over synthetic bundles")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="use small sweeps only")
+    parser.add_argument("--only", default=None, help="run only the cases of this function")
+    args = parser.parse_args()
+
+    for function, param, value in get_cases(args.quick):
+        if args.only is not None and function != args.only:
+            continue
+
+        print(json.dumps(run_case_isolated(function, param, value, args.repeat)))
+        sys.stdout.flush()
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Catalog startup benchmark, snapshot files against JSON dumps
+# Measures the time from opening the catalog file until the info of a few plugins is available, as a host does
+# at startup. JSON needs to load everything first, snapshots only decode the requested plugins.
+# By default the plugin info is generated directly (no lilv needed), use --scan to scan synthetic bundles instead.
+# Results are printed as one JSON object per line:
+#   { "plugins", "lookups", "json-size", "snapshot-size" (bytes), "json", "snapshot", "snapshot-open"
+#     (best of N, seconds), "speedup" }
+# "json" loads the dump and indexes it by uri, "snapshot" opens the snapshot; both then get @a lookups plugins.
+# "snapshot-open" only reads the header and index.
+# Usage: bench_snapshot.py [--repeat N] [--plugins N ...] [--lookups N ...] [--ports N] [--scan]
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import synth
+
+from lilvlib.snapshot import CatalogSnapshot, write_snapshot
+
+# ------------------------------------------------------------------------------------------------------------
+# Plugin info without lilv, same structure as get_plugin_info
+
+UNITS = (("decibels", "%f dB", "dB"), ("hertz", "%f Hz", "Hz"), ("milliseconds", "%f ms", "ms"), ("", "", ""))
+
+def make_port(index, symbol, control):
+    ulabel, urender, usymbol = UNITS[index % len(UNITS)]
+    return {
+        'index'      : index,
+        'name'       : "Control Parameter %i" % index if control else symbol.title(),
+        'symbol'     : symbol,
+        'ranges'     : { 'minimum': 0.0, 'maximum': 1.0, 'default': 0.5 } if control else {},
+        'units'      : { 'label': ulabel, 'render': urender, 'symbol': usymbol } if control and ulabel else {},
+        'comment'    : "",
+        'designation': "",
+        'properties' : ["logarithmic"] if control and index % 3 == 0 else [],
+        'rangeSteps' : None,
+        'scalePoints': [],
+        'shortName'  : "Control %i" % index if control else symbol.title(),
+    }
+
+def make_info(i, ports):
+    uri = synth.get_plugin_uri("plugin%i" % i)
+    return {
+        'uri'         : uri,
+        'name'        : "Bench plugin%i" % i,
+        'binary'      : "plugin%i.so" % i,
+        'brand'       : "lilvlib",
+        'label'       : "plugin%i" % i,
+        'license'     : "http://opensource.org/licenses/isc",
+        'comment'     : "Synthetic plugin for benchmarks",
+        'category'    : ["Delay"] if i % 2 else ["Modulator", "Chorus"],
+        'microVersion': 0,
+        'minorVersion': 2,
+        'version'     : "0.2",
+        'stability'   : "testing",
+        'author'      : { 'name': "lilvlib", 'homepage': "http://example.org/", 'email': "bench@example.org" },
+        'bundles'     : ["/usr/lib/lv2/plugin%i.lv2/" % i],
+        'gui'         : {},
+        'ports'       : {
+            'audio'  : { 'input': [make_port(0, "in", False)], 'output': [make_port(1, "out", False)] },
+            'control': { 'input': [make_port(j + 2, "control%i" % j, True) for j in range(ports)], 'output': [] },
+            'midi'   : { 'input': [], 'output': [] },
+        },
+        'presets'     : [],
+        'errors'      : [],
+        'warnings'    : ["plugin author email entry is missing 'mailto:' prefix"],
+    }
+
+def get_infos(count, ports, scan, tmpdir):
+    if not scan:
+        return [make_info(i, ports) for i in range(count)]
+
+    import lilvlib
+    return lilvlib.get_plugins_info(synth.make_plugin_bundles(tmpdir, count, ports=ports))
+
+# ------------------------------------------------------------------------------------------------------------
+
+def timeit(func, repeat):
+    best = None
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        took  = time.perf_counter() - start
+
+        if best is None or took < best:
+            best = took
+
+    return best
+
+def run(count, ports, scan, lookups, repeat):
+    tmpdir = tempfile.mkdtemp(prefix="lilvlib-bench-")
+
+    try:
+        infos    = get_infos(count, ports, scan, tmpdir)
+        jsonfile = os.path.join(tmpdir, "catalog.json")
+        snapfile = os.path.join(tmpdir, "catalog.snapshot")
+
+        with open(jsonfile, 'w') as fd:
+            json.dump(infos, fd)
+
+        write_snapshot(snapfile, infos)
+
+        # spread over the whole catalog
+        uris = [info['uri'] for info in infos][::max(1, count // lookups)][:lookups]
+
+        def get_json():
+            with open(jsonfile, 'r') as fd:
+                plugins = dict((info['uri'], info) for info in json.load(fd))
+            return [plugins[uri] for uri in uris]
+
+        def get_snapshot():
+            with CatalogSnapshot(snapfile) as snapshot:
+                return [snapshot.get(uri) for uri in uris]
+
+        def open_snapshot():
+            CatalogSnapshot(snapfile).close()
+
+        if get_snapshot() != get_json():
+            raise Exception("snapshot data does not match")
+
+        with CatalogSnapshot(snapfile) as snapshot:
+            if [snapshot.get(info['uri']) for info in infos] != infos:
+                raise Exception("snapshot data does not match")
+
+        jsontime = timeit(get_json, repeat)
+        snaptime = timeit(get_snapshot, repeat)
+
+        result = {
+            'plugins'      : count,
+            'lookups'      : len(uris),
+            'json-size'    : os.path.getsize(jsonfile),
+            'snapshot-size': os.path.getsize(snapfile),
+            'json'         : jsontime,
+            'snapshot'     : snaptime,
+            'snapshot-open': timeit(open_snapshot, repeat),
+            'speedup'      : jsontime / snaptime,
+        }
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="lilvlib snapshot startup benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--plugins", type=int, nargs="*", default=[100, 1000])
+    parser.add_argument("--lookups", type=int, nargs="*", default=[1, 10, 100])
+    parser.add_argument("--ports", type=int, default=8)
+    parser.add_argument("--scan", action="store_true", help="scan synthetic bundles with lilv")
+    args = parser.parse_args()
+
+    for count in args.plugins:
+        for lookups in args.lookups:
+            print(json.dumps(run(count, args.ports, args.scan, lookups, args.repeat)))
+            sys.stdout.flush()
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
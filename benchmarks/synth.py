@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Synthetic LV2 bundle generator for the lilvlib benchmarks
+# Creates plugin and pedalboard bundles with a configurable amount of ports, scale points, presets and modgui data.
+# The plugins have no real binary, which is fine for lilv since it never loads them here.
+# Usage: synth.py [--plugins N] [--ports N] [--scalepoints N] [--presets N] [--modgui]
+#                 [--pedalboards N] [--blocks N] [--arcs N] outdir
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import argparse
+import os
+import sys
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+PLUGIN_URI_BASE = "http://example.org/lilvlib-bench/"
+
+PREFIXES = """@prefix doap:   <http://usefulinc.com/ns/doap#> .
+@prefix foaf:   <http://xmlns.com/foaf/0.1/> .
+@prefix ingen:  <http://drobilla.net/ns/ingen#> .
+@prefix lv2:    <http://lv2plug.in/ns/lv2core#> .
+@prefix mod:    <http://moddevices.com/ns/mod#> .
+@prefix modgui: <http://moddevices.com/ns/modgui#> .
+@prefix pedal:  <http://moddevices.com/ns/modpedal#> .
+@prefix pset:   <http://lv2plug.in/ns/ext/presets#> .
+@prefix rdf:    <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+@prefix rdfs:   <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix units:  <http://lv2plug.in/ns/extensions/units#> .
+
+"""
+
+UNITS = ("db", "hz", "ms", "pc", "s", "bpm")
+
+# ------------------------------------------------------------------------------------------------------------
+# Utilities
+
+def write_file(path, data):
+    dirname = os.path.dirname(path)
+    if not os.path.exists(dirname):
+        os.makedirs(dirname)
+    with open(path, 'w') as fd:
+        fd.write(data)
+
+def get_plugin_uri(name):
+    return PLUGIN_URI_BASE + name
+
+# ------------------------------------------------------------------------------------------------------------
+# make_plugin_bundle
+
+# Create a plugin bundle, returns its path
+# @a ports is the number of control ports, an audio input and output are always added.
+# @a presetLabelsInManifest also declares the preset labels in the manifest, like some hosts do.
+def make_plugin_bundle(outdir, name, ports = 8, scalepoints = 0, presets = 0, modgui = False,
+                       presetLabelsInManifest = False):
+    bundle = os.path.join(outdir, "%s.lv2" % name)
+    uri    = get_plugin_uri(name)
+
+    # manifest
+    manifest  = PREFIXES
+    manifest += "<%s>\n    a lv2:Plugin ;\n    lv2:binary <%s.so> ;\n    rdfs:seeAlso <%s.ttl>%s .\n\n" % (
+                uri, name, name, " , <modgui.ttl>" if modgui else "")
+
+    for i in range(presets):
+        manifest += "<presets/preset%i.ttl>\n    a pset:Preset ;\n    lv2:appliesTo <%s> ;\n" % (i, uri)
+        if presetLabelsInManifest:
+            manifest += "    rdfs:label \"Preset %i\" ;\n" % i
+        manifest += "    rdfs:seeAlso <presets/preset%i.ttl> .\n\n" % i
+
+    write_file(os.path.join(bundle, "manifest.ttl"), manifest)
+
+    # plugin data
+    portdata = [
+        "[\n        a lv2:AudioPort, lv2:InputPort ;\n        lv2:index 0 ;\n"
+        "        lv2:symbol \"in\" ;\n        lv2:name \"In\" ;\n    ]",
+        "[\n        a lv2:AudioPort, lv2:OutputPort ;\n        lv2:index 1 ;\n"
+        "        lv2:symbol \"out\" ;\n        lv2:name \"Out\" ;\n    ]",
+    ]
+
+    for i in range(ports):
+        port  = "[\n        a lv2:ControlPort, lv2:InputPort ;\n"
+        port += "        lv2:index %i ;\n" % (i + 2)
+        port += "        lv2:symbol \"control%i\" ;\n" % i
+        port += "        lv2:name \"Control Parameter %i\" ;\n" % i
+        port += "        lv2:default 0.5 ;\n        lv2:minimum 0.0 ;\n        lv2:maximum 1.0 ;\n"
+        port += "        units:unit units:%s ;\n" % UNITS[i % len(UNITS)]
+
+        for j in range(scalepoints):
+            port += "        lv2:scalePoint [ rdfs:label \"Point %i\" ; rdf:value %f ] ;\n" % (j, float(j) / scalepoints)
+
+        port += "    ]"
+        portdata.append(port)
+
+    data  = PREFIXES
+    data += "<%s>\n" % uri
+    data += "    a lv2:Plugin, lv2:DelayPlugin ;\n"
+    data += "    doap:name \"Bench %s\" ;\n" % name
+    data += "    doap:license <http://opensource.org/licenses/isc> ;\n"
+    data += "    doap:maintainer [\n        foaf:name \"lilvlib\" ;\n"
+    data += "        foaf:homepage <http://example.org/> ;\n        foaf:mbox <mailto:bench@example.org> ;\n    ] ;\n"
+    data += "    mod:brand \"lilvlib\" ;\n"
+    data += "    mod:label \"%s\" ;\n" % name[:16]
+    data += "    rdfs:comment \"Synthetic plugin for benchmarks\" ;\n"
+    data += "    lv2:minorVersion 2 ;\n    lv2:microVersion 0 ;\n"
+    data += "    lv2:port %s .\n" % (" , ".join(portdata))
+
+    write_file(os.path.join(bundle, "%s.ttl" % name), data)
+
+    # presets
+    for i in range(presets):
+        preset  = PREFIXES
+        preset += "<>\n    a pset:Preset ;\n    lv2:appliesTo <%s> ;\n    rdfs:label \"Preset %i\" ;\n" % (uri, i)
+        preset += "    lv2:port [\n        lv2:symbol \"control0\" ;\n        pset:value 0.25 ;\n    ] .\n"
+        write_file(os.path.join(bundle, "presets", "preset%i.ttl" % i), preset)
+
+    # modgui
+    if modgui:
+        gui  = PREFIXES
+        gui += "<%s>\n    modgui:gui [\n" % uri
+        gui += "        modgui:resourcesDirectory <modgui> ;\n"
+        gui += "        modgui:iconTemplate <modgui/icon.html> ;\n"
+        gui += "        modgui:settingsTemplate <modgui/settings.html> ;\n"
+        gui += "        modgui:javascript <modgui/script.js> ;\n"
+        gui += "        modgui:stylesheet <modgui/stylesheet.css> ;\n"
+        gui += "        modgui:screenshot <modgui/screenshot.png> ;\n"
+        gui += "        modgui:thumbnail <modgui/thumbnail.png> ;\n"
+        gui += "        modgui:brand \"lilvlib\" ;\n"
+        gui += "        modgui:label \"%s\" ;\n" % name[:16]
+        gui += "        modgui:model \"boxy\" ;\n        modgui:panel \"1-knob\" ;\n"
+        gui += "        modgui:color \"black\" ;\n        modgui:knob \"aluminium\""
+
+        for i in range(ports):
+            gui += " ;\n        modgui:port [\n            lv2:index %i ;\n" % i
+            gui += "            lv2:symbol \"control%i\" ;\n            lv2:name \"Control %i\" ;\n        ]" % (i, i)
+
+        gui += " ;\n    ] .\n"
+        write_file(os.path.join(bundle, "modgui.ttl"), gui)
+
+        for filename in ("icon.html", "settings.html", "script.js", "stylesheet.css",
+                         "screenshot.png", "thumbnail.png"):
+            write_file(os.path.join(bundle, "modgui", filename), "")
+
+    return bundle + os.sep
+
+# ------------------------------------------------------------------------------------------------------------
+# make_pedalboard_bundle
+
+# Create a pedalboard bundle using @a blocks instances of @a pluginuri, returns its path
+# @a arcs connections are created, chaining the blocks together and then wrapping around.
+def make_pedalboard_bundle(outdir, name, blocks = 4, arcs = None, pluginuri = None):
+    bundle = os.path.join(outdir, "%s.pedalboard" % name)
+
+    if arcs is None:
+        arcs = blocks + 1
+    if pluginuri is None:
+        pluginuri = get_plugin_uri("plugin0")
+
+    manifest  = PREFIXES
+    manifest += "<%s.ttl>\n    lv2:prototype ingen:GraphPrototype ;\n" % name
+    manifest += "    a lv2:Plugin, ingen:Graph, pedal:Pedalboard ;\n"
+    manifest += "    rdfs:seeAlso <%s.ttl> .\n" % name
+    write_file(os.path.join(bundle, "manifest.ttl"), manifest)
+
+    nodes = ["capture_1"] + ["block%i" % i for i in range(blocks)] + ["playback_1"]
+
+    data = PREFIXES
+
+    for i in range(arcs):
+        src = nodes[i % (len(nodes) - 1)]
+        dst = nodes[i % (len(nodes) - 1) + 1]
+        data += "_:arc%i\n    ingen:tail <%s> ;\n    ingen:head <%s> .\n\n" % (
+                i, src if src == "capture_1" else src + "/out", dst if dst == "playback_1" else dst + "/in")
+
+    for i in range(blocks):
+        data += "<block%i>\n    ingen:canvasX %f ;\n    ingen:canvasY %f ;\n" % (i, 100.0 * i, 200.0)
+        data += "    ingen:enabled true ;\n    ingen:polyphonic false ;\n"
+        data += "    lv2:microVersion 0 ;\n    lv2:minorVersion 2 ;\n"
+        data += "    mod:builderVersion 1 ;\n    mod:releaseNumber 0 ;\n"
+        data += "    lv2:prototype <%s> ;\n    a ingen:Block .\n\n" % pluginuri
+
+    data += "<capture_1>\n    lv2:index 0 ;\n    lv2:name \"Capture 1\" ;\n    lv2:symbol \"capture_1\" ;\n"
+    data += "    a lv2:AudioPort, lv2:InputPort .\n\n"
+    data += "<playback_1>\n    lv2:index 1 ;\n    lv2:name \"Playback 1\" ;\n    lv2:symbol \"playback_1\" ;\n"
+    data += "    a lv2:AudioPort, lv2:OutputPort .\n\n"
+
+    data += "<>\n    doap:name \"%s\" ;\n" % name
+    data += "    pedal:screenshot <screenshot.png> ;\n    pedal:thumbnail <thumbnail.png> ;\n"
+    data += "    pedal:width 3000 ;\n    pedal:height 1500 ;\n"
+    if arcs:
+        data += "    ingen:arc %s ;\n" % " , ".join("_:arc%i" % i for i in range(arcs))
+    if blocks:
+        data += "    ingen:block %s ;\n" % " , ".join("<block%i>" % i for i in range(blocks))
+    data += "    lv2:port <capture_1> , <playback_1> ;\n"
+    data += "    a lv2:Plugin, ingen:Graph, pedal:Pedalboard .\n"
+
+    write_file(os.path.join(bundle, "%s.ttl" % name), data)
+
+    for filename in ("screenshot.png", "thumbnail.png"):
+        write_file(os.path.join(bundle, filename), "")
+
+    return bundle + os.sep
+
+# ------------------------------------------------------------------------------------------------------------
+# make_plugin_bundles
+
+# Create @a count plugin bundles named plugin0, plugin1, etc, returns their paths
+def make_plugin_bundles(outdir, count, **kwargs):
+    return [make_plugin_bundle(outdir, "plugin%i" % i, **kwargs) for i in range(count)]
+
+# ------------------------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="synthetic LV2 bundle generator")
+    parser.add_argument("--plugins", type=int, default=10)
+    parser.add_argument("--ports", type=int, default=8)
+    parser.add_argument("--scalepoints", type=int, default=0)
+    parser.add_argument("--presets", type=int, default=0)
+    parser.add_argument("--modgui", action="store_true")
+    parser.add_argument("--pedalboards", type=int, default=0)
+    parser.add_argument("--blocks", type=int, default=4)
+    parser.add_argument("--arcs", type=int, default=None)
+    parser.add_argument("outdir")
+    args = parser.parse_args()
+
+    make_plugin_bundles(args.outdir, args.plugins, ports=args.ports, scalepoints=args.scalepoints,
+                        presets=args.presets, modgui=args.modgui)
+
+    for i in range(args.pedalboards):
+        make_pedalboard_bundle(args.outdir, "pedalboard%i" % i, args.blocks, args.arcs)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
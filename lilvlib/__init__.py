@@ -1,3 +1,89 @@
-from lilvlib.lilvlib import (
-    get_pedalboard_info, get_pedalboard_name, plugin_has_modgui, get_plugin_info, get_plugins_info, get_bundle_dirname, NS
-)
+import sys
+
+# Public names and the module that provides each of them
+# Modules are only imported on first use, so the lilv binding (and asyncio, sqlite3, etc) are not loaded
+# by code that only needs the pure python helpers.
+_EXPORTS = {
+    'lilvlib': (
+        'get_pedalboard_info', 'get_pedalboard_name', 'get_pedalboards_list', 'plugin_has_modgui', 'get_plugin_info',
+        'get_plugin_info_helper', 'get_plugin_info_lazy', 'get_plugins_info', 'iter_plugins_info', 'get_bundle_dirname',
+        'get_bundle_path', 'get_pedalboard_bundles', 'iter_pedalboards_info', 'get_plugins_presets', 'preload_presets',
+        'PluginInfo', 'WorldManager', 'NS', 'PRESETS_MODES', 'get_world_ns', 'get_world_node', 'get_world_node_count',
+        'free_world_nodes',
+        'main'
+    ),
+    'portdata': (
+        'get_short_port_name', 'get_port_unit'
+    ),
+    'cache': (
+        'PluginInfoCache', 'get_bundle_fingerprint', 'get_group_fingerprint'
+    ),
+    'index': (
+        'PluginIndex', 'get_lv2_path', 'get_lv2_bundles'
+    ),
+    'pedalboard': (
+        'get_pedalboard_summary',
+    ),
+    'category': (
+        'CATEGORIES', 'CategoryIndex', 'get_categories', 'get_category_mask', 'get_mask_categories'
+    ),
+    'compact': (
+        'PortRecord', 'StringPool', 'compact_plugin_info', 'expand_plugin_info'
+    ),
+    'catalog': (
+        'PluginCatalog', 'get_port_counts'
+    ),
+    'database': (
+        'PluginDatabase',
+    ),
+    'snapshot': (
+        'CatalogSnapshot', 'SnapshotError', 'write_snapshot'
+    ),
+    'watch': (
+        'BundleWatcher', 'IncrementalCatalog'
+    ),
+    'instrument': (
+        'ScanInstrument',
+    ),
+    'aio': (
+        'AsyncScanner',
+    ),
+    'daemon': (
+        'LilvClient', 'LilvDaemon', 'get_socket_path'
+    ),
+}
+
+# the asyncio front-end needs python 3.6
+if sys.version_info < (3, 6):
+    del _EXPORTS['aio']
+
+_MODULES = dict((name, module) for module, names in _EXPORTS.items() for name in names)
+
+__all__ = sorted(_MODULES)
+
+def __getattr__(name):
+    # submodules, as in "import lilvlib; lilvlib.lilvlib.get_port_data(...)"
+    if name in _EXPORTS:
+        return __import__("lilvlib." + name, fromlist=["__name__"])
+
+    module = _MODULES.get(name, None)
+
+    if module is None:
+        raise AttributeError("module 'lilvlib' has no attribute '%s'" % name)
+
+    value = getattr(__import__("lilvlib." + module, fromlist=[name]), name)
+
+    # next lookups do not go through here
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+# module __getattr__ (PEP 562) needs python 3.7, older versions import everything right away
+if sys.version_info < (3, 7):
+    for _module, _names in _EXPORTS.items():
+        _module = __import__("lilvlib." + _module, fromlist=list(_names))
+        for _name in _names:
+            globals()[_name] = getattr(_module, _name)
+    del _module, _names, _name
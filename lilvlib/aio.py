@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+
+from lilvlib.lilvlib import (
+    WorldManager, get_pedalboard_info, get_pedalboard_name, get_pedalboards_list, get_plugin_info_helper,
+    iter_pedalboards_info, iter_plugins_info
+)
+
+# ------------------------------------------------------------------------------------------------------------
+# AsyncScanner
+
+# asyncio front-end for the lilvlib scans, so event loops are never blocked by lilv
+# All lilv work runs on a single dedicated thread, which owns the lilv world, so the world is never touched by two
+# threads. Iterators produce one plugin or pedalboard per step, which is also where cancellation takes effect:
+# a cancelled scan finishes the current plugin and stops there.
+# @a loop is the event loop to use, defaults to the running one.
+class AsyncScanner(object):
+    def __init__(self, loop = None):
+        self.loop     = loop
+        self.manager  = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lilvlib")
+
+    def _get_loop(self):
+        if self.loop is not None:
+            return self.loop
+        return asyncio.get_event_loop()
+
+    # only ever called from the executor thread
+    def _get_manager(self):
+        if self.manager is None:
+            self.manager = WorldManager()
+        return self.manager
+
+    def _call(self, func, *args, **kwargs):
+        kwargs['manager'] = self._get_manager()
+        return func(*args, **kwargs)
+
+    # Run a function on the lilv thread, passing it the shared WorldManager as 'manager'
+    async def run(self, func, *args, **kwargs):
+        return await self._get_loop().run_in_executor(self.executor, lambda: self._call(func, *args, **kwargs))
+
+    # Go through a generator on the lilv thread, one item at a time
+    async def _iterate(self, func, *args, **kwargs):
+        loop = self._get_loop()
+        gen  = await loop.run_in_executor(self.executor, lambda: self._call(func, *args, **kwargs))
+        done = object()
+
+        try:
+            while True:
+                item = await loop.run_in_executor(self.executor, next, gen, done)
+                if item is done:
+                    break
+                yield item
+
+        finally:
+            # queued after the step that might still be running, so the generator is closed on its own thread
+            # if the scanner was closed already there is no lilv thread left, the error that got us here matters more
+            try:
+                self.executor.submit(gen.close)
+            except RuntimeError:
+                pass
+
+    # ----------------------------------------------------------------------------------------------------
+    # plugins
+
+    # Same as get_plugin_info_helper, for a single plugin uri
+    async def get_plugin_info(self, uri):
+        return await self.run(get_plugin_info_helper, uri)
+
+    # Same as iter_plugins_info, as an async iterator
+    # Extra arguments (cache, jobs, presets, validate, etc) are passed along.
+    def iter_plugins_info(self, bundles, **kwargs):
+        return self._iterate(iter_plugins_info, bundles, **kwargs)
+
+    # Same as get_plugins_info, collecting iter_plugins_info results
+    async def get_plugins_info(self, bundles, **kwargs):
+        infos = []
+
+        async for info in self.iter_plugins_info(bundles, **kwargs):
+            infos.append(info)
+
+        if len(infos) == 0:
+            raise Exception('get_plugins_info() - selected bundles have no plugins')
+
+        infos.sort(key=lambda info: info['uri'])
+        return infos
+
+    # ----------------------------------------------------------------------------------------------------
+    # pedalboards
+
+    async def get_pedalboard_info(self, bundle):
+        return await self.run(get_pedalboard_info, bundle)
+
+    async def get_pedalboard_name(self, bundle):
+        return await self.run(get_pedalboard_name, bundle)
+
+    async def get_pedalboards_list(self, bundles):
+        return await self.run(get_pedalboards_list, bundles)
+
+    # Same as iter_pedalboards_info, as an async iterator of (bundle, info, error)
+    def iter_pedalboards_info(self, rootdir):
+        return self._iterate(iter_pedalboards_info, rootdir)
+
+    # ----------------------------------------------------------------------------------------------------
+
+    # Stop the lilv thread, the world is released with it
+    # Pending work is finished first unless @a wait is False.
+    def close(self, wait = True):
+        def release():
+            self.manager = None
+        self.executor.submit(release)
+        self.executor.shutdown(wait=wait)
+
+# ------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import hashlib
+import json
+import os
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+# bump this whenever the format of the stored plugin info changes
+CACHE_VERSION = 2
+
+# ------------------------------------------------------------------------------------------------------------
+# get_bundle_fingerprint
+
+# Get a fingerprint of all the TTL files inside a bundle
+# Uses path, size and mtime of each file, unless @a hashContents is set, in which case the file data is used.
+# @a bundle is a string, consisting of a directory in the filesystem (absolute pathname).
+def get_bundle_fingerprint(bundle, hashContents = False):
+    fingerprint = hashlib.sha1()
+
+    if not os.path.isdir(bundle):
+        return ""
+
+    for root, dirs, files in os.walk(bundle):
+        # walk in a stable order, so the same bundle always gives the same fingerprint
+        dirs.sort()
+
+        for filename in sorted(files):
+            if not filename.endswith(".ttl"):
+                continue
+
+            path = os.path.join(root, filename)
+
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            fingerprint.update(os.path.relpath(path, bundle).encode("utf-8", "surrogateescape"))
+
+            if hashContents:
+                with open(path, 'rb') as fd:
+                    fingerprint.update(hashlib.sha1(fd.read()).digest())
+            else:
+                fingerprint.update(("|%i|%i\n" % (stat.st_size, stat.st_mtime_ns)).encode("utf-8"))
+
+    return fingerprint.hexdigest()
+
+# Get a single fingerprint for a group of bundles that share plugins, from the fingerprint of each bundle
+# The bundle paths are part of it, so adding or removing a bundle also changes the group fingerprint.
+# A group of a single bundle keeps the fingerprint of that bundle, empty fingerprints make the group one empty.
+# @a fingerprints is a list of (bundle, fingerprint).
+def get_group_fingerprint(fingerprints):
+    if len(fingerprints) == 1:
+        return fingerprints[0][1]
+
+    group = hashlib.sha1()
+
+    for bundle, fingerprint in fingerprints:
+        if not fingerprint:
+            return ""
+        group.update(("%s|%s\n" % (bundle, fingerprint)).encode("utf-8", "surrogateescape"))
+
+    return group.hexdigest()
+
+# ------------------------------------------------------------------------------------------------------------
+# PluginInfoCache
+
+# Persistent cache for get_plugins_info results
+# Each bundle stores the info of its plugins together with the fingerprint of its TTL files,
+# so that unchanged bundles can skip lilv completely.
+# @a filename is the file used for load/save, None means the cache only lives in memory.
+class PluginInfoCache(object):
+    def __init__(self, filename = None, hashContents = False):
+        self.filename     = filename
+        self.hashContents = hashContents
+        self.hits     = 0
+        self.misses   = 0
+        self._entries = {}
+        self._dirty   = False
+
+        if filename is not None and os.path.exists(filename):
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, bundle):
+        return bundle in self._entries
+
+    def fingerprint(self, bundle):
+        return get_bundle_fingerprint(bundle, self.hashContents)
+
+    # Get the cached plugins of a bundle, or None if the bundle is unknown or changed
+    # @a variant identifies the scan options used, entries stored with other options are not used.
+    def get(self, bundle, fingerprint, variant = ""):
+        entry = self._entries.get(bundle, None)
+
+        if entry is None or not fingerprint or entry['fingerprint'] != fingerprint or entry['variant'] != variant:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry['plugins']
+
+    def put(self, bundle, fingerprint, plugins, variant = ""):
+        self._entries[bundle] = {
+            'fingerprint': fingerprint,
+            'variant'    : variant,
+            'plugins'    : plugins,
+        }
+        self._dirty = True
+
+    # Drop a single bundle from the cache, or everything if @a bundle is None
+    def invalidate(self, bundle = None):
+        if bundle is None:
+            if len(self._entries) != 0:
+                self._entries = {}
+                self._dirty   = True
+            return
+
+        if self._entries.pop(bundle, None) is not None:
+            self._dirty = True
+
+    def reset_stats(self):
+        self.hits   = 0
+        self.misses = 0
+
+    def load(self):
+        try:
+            with open(self.filename, 'r') as fd:
+                data = json.load(fd)
+        except (IOError, ValueError):
+            data = {}
+
+        # silently discard caches from other versions
+        if data.get('version', None) != CACHE_VERSION or self.hashContents != data.get('hashContents', False):
+            self._entries = {}
+        else:
+            self._entries = data['bundles']
+
+        self._dirty = False
+
+    def save(self):
+        if self.filename is None or not self._dirty:
+            return
+
+        dirname = os.path.dirname(os.path.abspath(self.filename))
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+
+        # write to a temporary file first, so an interrupted save never leaves a broken cache behind
+        tmpfile = "%s.tmp%i" % (self.filename, os.getpid())
+
+        with open(tmpfile, 'w') as fd:
+            json.dump({
+                'version'     : CACHE_VERSION,
+                'hashContents': self.hashContents,
+                'bundles'     : self._entries,
+            }, fd)
+
+        os.replace(tmpfile, self.filename)
+        self._dirty = False
+
+# ------------------------------------------------------------------------------------------------------------
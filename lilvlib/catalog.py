@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import os
+
+from lilvlib.category import CategoryIndex
+
+# ------------------------------------------------------------------------------------------------------------
+# get_port_counts
+
+# Get the number of ports of a plugin per type and direction, as { type: { 'input': n, 'output': n } }
+# @a ports is the 'ports' entry of get_plugin_info.
+def get_port_counts(ports):
+    return dict((typ, { 'input': len(dirs['input']), 'output': len(dirs['output']) }) for typ, dirs in ports.items())
+
+# ------------------------------------------------------------------------------------------------------------
+# PluginCatalog
+
+# In-memory catalog of get_plugins_info results, with hash indexes for fast lookups
+# Plugins are indexed by uri, brand, author name, bundle, stability, categories and port counts per type and
+# direction, so compound filters are just intersections of the matching index sets.
+# @a plugins are plugin infos, or (bundle, info) pairs; bundle lookups need the pairs, as scan results do not have
+# absolute bundle paths, so build it with PluginCatalog(iter_plugins_info(bundles, withBundle=True)).
+class PluginCatalog(object):
+    def __init__(self, plugins = None):
+        # uri -> info, uri -> port counts, and uri -> bundle keys
+        self.plugins       = {}
+        self.portcounts    = {}
+        self.pluginbundles = {}
+
+        # value -> set of uris
+        self.brands      = {}
+        self.authors     = {}
+        self.bundles     = {}
+        self.stabilities = {}
+
+        # (type, direction, count) -> set of uris
+        self.ports = {}
+
+        self.categories = CategoryIndex()
+
+        if plugins is not None:
+            for info in plugins:
+                if isinstance(info, tuple):
+                    self.add(info[1], info[0])
+                else:
+                    self.add(info)
+
+    def __len__(self):
+        return len(self.plugins)
+
+    def __contains__(self, uri):
+        return uri in self.plugins
+
+    def __iter__(self):
+        return iter(self.plugins.values())
+
+    # ----------------------------------------------------------------------------------------------------
+    # changes
+
+    # Add or replace a plugin
+    # @a bundle is the bundle the plugin was scanned from, needed for bundle lookups when the info has no
+    # 'bundles' entries (get_plugins_info does not use absolute paths, so they are always empty there).
+    # If not provided the 'bundles' entry of the info is used.
+    def add(self, info, bundle = None):
+        uri = info['uri']
+
+        if uri in self.plugins:
+            self.remove(uri)
+
+        counts  = get_port_counts(info['ports'])
+        bundles = info['bundles'] if bundle is None else [bundle]
+
+        self.plugins[uri]       = info
+        self.portcounts[uri]    = counts
+        self.pluginbundles[uri] = tuple(_get_bundle_key(bundle) for bundle in bundles)
+
+        for index, key in self._get_keys(info, counts):
+            index.setdefault(key, set()).add(uri)
+
+        self.categories.add(info)
+
+    # Remove a plugin, does nothing if unknown
+    def remove(self, uri):
+        info = self.plugins.pop(uri, None)
+
+        if info is None:
+            return
+
+        counts = self.portcounts.pop(uri)
+
+        for index, key in self._get_keys(info, counts):
+            uris = index[key]
+            uris.discard(uri)
+            if len(uris) == 0:
+                del index[key]
+
+        del self.pluginbundles[uri]
+        self.categories.remove(uri)
+
+    def _get_keys(self, info, counts):
+        keys = [
+            (self.brands,      info['brand']),
+            (self.authors,     info['author']['name']),
+            (self.stabilities, info['stability']),
+        ]
+
+        for bundle in self.pluginbundles[info['uri']]:
+            keys.append((self.bundles, bundle))
+
+        for typ, dirs in counts.items():
+            for direction, count in dirs.items():
+                keys.append((self.ports, (typ, direction, count)))
+
+        return keys
+
+    # ----------------------------------------------------------------------------------------------------
+    # lookups
+
+    # Get the info of a plugin, or None if unknown
+    def get(self, uri):
+        return self.plugins.get(uri, None)
+
+    def get_port_counts(self, uri):
+        return self.portcounts[uri]
+
+    def get_by_brand(self, brand):
+        return self._get_infos(self.brands.get(brand, ()))
+
+    def get_by_author(self, author):
+        return self._get_infos(self.authors.get(author, ()))
+
+    def get_by_bundle(self, bundle):
+        return self._get_infos(self.bundles.get(_get_bundle_key(bundle), ()))
+
+    def _get_infos(self, uris):
+        return [self.plugins[uri] for uri in sorted(uris)]
+
+    # ----------------------------------------------------------------------------------------------------
+    # filters
+
+    # Get the info of all plugins matching every given condition, sorted by uri
+    # @a categories matches plugins in any of the categories (or all of them, with @a matchAllCategories).
+    # @a ports is a dict of (type, direction) -> exact count, for example { ('audio', 'input'): 2 },
+    # a count of 0 also matches plugins without that port type.
+    # @a hasMidi matches plugins with (True) or without (False) any midi port.
+    def filter(self, brand = None, author = None, bundle = None, stability = None, categories = None,
+               matchAllCategories = False, ports = None, hasMidi = None):
+        sets    = []
+        exclude = []
+
+        if brand is not None:
+            sets.append(self.brands.get(brand, set()))
+        if author is not None:
+            sets.append(self.authors.get(author, set()))
+        if bundle is not None:
+            sets.append(self.bundles.get(_get_bundle_key(bundle), set()))
+        if stability is not None:
+            sets.append(self.stabilities.get(stability, set()))
+        if categories is not None:
+            sets.append(set(self.categories.filter(categories, matchAllCategories)))
+
+        if ports is not None:
+            for (typ, direction), count in ports.items():
+                if count != 0:
+                    sets.append(self.ports.get((typ, direction, count), set()))
+                    continue
+
+                # plugins without any port of this kind
+                for key, uris in self.ports.items():
+                    if key[0] == typ and key[1] == direction and key[2] != 0:
+                        exclude.append(uris)
+
+        if hasMidi is not None:
+            midi = set()
+            for key, uris in self.ports.items():
+                if key[0] == "midi" and key[2] != 0:
+                    midi.update(uris)
+
+            if hasMidi:
+                sets.append(midi)
+            else:
+                exclude.append(midi)
+
+        # intersect starting from the smallest set
+        if len(sets) != 0:
+            sets.sort(key=len)
+            uris = set(sets[0])
+            for other in sets[1:]:
+                uris.intersection_update(other)
+                if len(uris) == 0:
+                    break
+        else:
+            uris = set(self.plugins.keys())
+
+        for other in exclude:
+            uris.difference_update(other)
+
+        return self._get_infos(uris)
+
+# ------------------------------------------------------------------------------------------------------------
+
+def _get_bundle_key(bundle):
+    return os.path.abspath(bundle) + os.sep
+
+# ------------------------------------------------------------------------------------------------------------
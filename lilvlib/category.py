@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+NS_LV2 = "http://lv2plug.in/ns/lv2core#"
+NS_MOD = "http://moddevices.com/ns/mod#"
+
+# lv2 plugin class URI -> categories
+LV2_CATEGORIES = {
+    NS_LV2 + 'DelayPlugin': ['Delay'],
+    NS_LV2 + 'DistortionPlugin': ['Distortion'],
+    NS_LV2 + 'WaveshaperPlugin': ['Distortion', 'Waveshaper'],
+    NS_LV2 + 'DynamicsPlugin': ['Dynamics'],
+    NS_LV2 + 'AmplifierPlugin': ['Dynamics', 'Amplifier'],
+    NS_LV2 + 'CompressorPlugin': ['Dynamics', 'Compressor'],
+    NS_LV2 + 'ExpanderPlugin': ['Dynamics', 'Expander'],
+    NS_LV2 + 'GatePlugin': ['Dynamics', 'Gate'],
+    NS_LV2 + 'LimiterPlugin': ['Dynamics', 'Limiter'],
+    NS_LV2 + 'FilterPlugin': ['Filter'],
+    NS_LV2 + 'AllpassPlugin': ['Filter', 'Allpass'],
+    NS_LV2 + 'BandpassPlugin': ['Filter', 'Bandpass'],
+    NS_LV2 + 'CombPlugin': ['Filter', 'Comb'],
+    NS_LV2 + 'EQPlugin': ['Filter', 'Equaliser'],
+    NS_LV2 + 'MultiEQPlugin': ['Filter', 'Equaliser', 'Multiband'],
+    NS_LV2 + 'ParaEQPlugin': ['Filter', 'Equaliser', 'Parametric'],
+    NS_LV2 + 'HighpassPlugin': ['Filter', 'Highpass'],
+    NS_LV2 + 'LowpassPlugin': ['Filter', 'Lowpass'],
+    NS_LV2 + 'GeneratorPlugin': ['Generator'],
+    NS_LV2 + 'ConstantPlugin': ['Generator', 'Constant'],
+    NS_LV2 + 'InstrumentPlugin': ['Generator', 'Instrument'],
+    NS_LV2 + 'OscillatorPlugin': ['Generator', 'Oscillator'],
+    NS_LV2 + 'ModulatorPlugin': ['Modulator'],
+    NS_LV2 + 'ChorusPlugin': ['Modulator', 'Chorus'],
+    NS_LV2 + 'FlangerPlugin': ['Modulator', 'Flanger'],
+    NS_LV2 + 'PhaserPlugin': ['Modulator', 'Phaser'],
+    NS_LV2 + 'ReverbPlugin': ['Reverb'],
+    NS_LV2 + 'SimulatorPlugin': ['Simulator'],
+    NS_LV2 + 'SpatialPlugin': ['Spatial'],
+    NS_LV2 + 'SpectralPlugin': ['Spectral'],
+    NS_LV2 + 'PitchPlugin': ['Spectral', 'Pitch Shifter'],
+    NS_LV2 + 'UtilityPlugin': ['Utility'],
+    NS_LV2 + 'AnalyserPlugin': ['Utility', 'Analyser'],
+    NS_LV2 + 'ConverterPlugin': ['Utility', 'Converter'],
+    NS_LV2 + 'FunctionPlugin': ['Utility', 'Function'],
+    NS_LV2 + 'MixerPlugin': ['Utility', 'Mixer'],
+    #NS_LV2 + 'MIDIPlugin': ['MIDI', 'Utility'],
+}
+
+# mod plugin class URI -> categories, these take precedence over the lv2 ones
+MOD_CATEGORIES = {
+    NS_MOD + 'DelayPlugin': ['Delay'],
+    NS_MOD + 'DistortionPlugin': ['Distortion'],
+    NS_MOD + 'DynamicsPlugin': ['Dynamics'],
+    NS_MOD + 'FilterPlugin': ['Filter'],
+    NS_MOD + 'GeneratorPlugin': ['Generator'],
+    NS_MOD + 'ModulatorPlugin': ['Modulator'],
+    NS_MOD + 'ReverbPlugin': ['Reverb'],
+    NS_MOD + 'SimulatorPlugin': ['Simulator'],
+    NS_MOD + 'SpatialPlugin': ['Spatial'],
+    NS_MOD + 'SpectralPlugin': ['Spectral'],
+    NS_MOD + 'UtilityPlugin': ['Utility'],
+    NS_MOD + 'MIDIPlugin': ['Utility', 'MIDI'],
+}
+
+# all known categories, the position of each one is its bit in category masks
+CATEGORIES = []
+
+for _categories in list(LV2_CATEGORIES.values()) + list(MOD_CATEGORIES.values()):
+    for _category in _categories:
+        if _category not in CATEGORIES:
+            CATEGORIES.append(_category)
+
+del _categories, _category
+
+CATEGORY_BITS = dict((category, 1 << i) for i, category in enumerate(CATEGORIES))
+
+# ------------------------------------------------------------------------------------------------------------
+# get_categories
+
+# Get the categories of a plugin from the URIs of its classes (rdf:type)
+# mod classes are used if there are any, the lv2 ones otherwise.
+def get_categories(classuris):
+    classuris = list(classuris)
+
+    for table in (MOD_CATEGORIES, LV2_CATEGORIES):
+        categories = []
+
+        for uri in classuris:
+            for category in table.get(uri, ()):
+                if category not in categories:
+                    categories.append(category)
+
+        if len(categories) > 0:
+            return categories
+
+    return []
+
+# ------------------------------------------------------------------------------------------------------------
+# get_category_mask
+
+# Get the bitmask of some category names, unknown names raise ValueError
+def get_category_mask(categories):
+    mask = 0
+
+    for category in categories:
+        try:
+            mask |= CATEGORY_BITS[category]
+        except KeyError:
+            raise ValueError("unknown category '%s'" % category)
+
+    return mask
+
+# Get the category names of a bitmask, in the same order as CATEGORIES
+def get_mask_categories(mask):
+    return [category for category in CATEGORIES if mask & CATEGORY_BITS[category]]
+
+# ------------------------------------------------------------------------------------------------------------
+# CategoryIndex
+
+# Index of plugin uri -> category bitmask, for fast category filtering over a whole catalog
+# Plugins are added from get_plugin_info results. Uris and masks are kept in two parallel lists,
+# so a filter is a single pass over plain integers.
+class CategoryIndex(object):
+    def __init__(self, plugins = None):
+        self.uris      = []
+        self.masks     = []
+        self.positions = {}
+
+        if plugins is not None:
+            for info in plugins:
+                self.add(info)
+
+    def __len__(self):
+        return len(self.uris)
+
+    def __contains__(self, uri):
+        return uri in self.positions
+
+    # Add or replace a plugin
+    def add(self, info):
+        uri  = info['uri']
+        mask = get_category_mask(info['category'])
+
+        if uri in self.positions:
+            self.masks[self.positions[uri]] = mask
+            return
+
+        self.positions[uri] = len(self.uris)
+        self.uris.append(uri)
+        self.masks.append(mask)
+
+    # Remove a plugin, does nothing if unknown
+    def remove(self, uri):
+        pos = self.positions.pop(uri, None)
+
+        if pos is None:
+            return
+
+        # move the last plugin into the empty spot
+        lasturi  = self.uris.pop()
+        lastmask = self.masks.pop()
+
+        if lasturi != uri:
+            self.uris[pos]  = lasturi
+            self.masks[pos] = lastmask
+            self.positions[lasturi] = pos
+
+    def get_mask(self, uri):
+        return self.masks[self.positions[uri]]
+
+    # Get the uris of the plugins in any of @a categories, or in all of them if @a matchAll is set
+    # Uris are returned sorted.
+    def filter(self, categories, matchAll = False):
+        want = get_category_mask(categories)
+
+        if matchAll:
+            uris = [uri for uri, mask in zip(self.uris, self.masks) if mask & want == want]
+        else:
+            uris = [uri for uri, mask in zip(self.uris, self.masks) if mask & want]
+
+        uris.sort()
+        return uris
+
+    # Get the number of plugins in each category
+    def count(self):
+        counts = dict((category, 0) for category in CATEGORIES)
+
+        for mask in self.masks:
+            for category in CATEGORIES:
+                if mask & CATEGORY_BITS[category]:
+                    counts[category] += 1
+
+        return counts
+
+# ------------------------------------------------------------------------------------------------------------
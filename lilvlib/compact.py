@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+# plugin entries stored as shared tuples of strings
+PLUGIN_STRING_LISTS = ('category', 'bundles', 'errors', 'warnings')
+
+# plugin entries stored as shared strings
+PLUGIN_STRINGS = ('uri', 'name', 'binary', 'brand', 'label', 'license', 'comment', 'version', 'stability')
+
+# range keys, in the same order as get_plugin_info
+RANGE_KEYS = ('minimum', 'maximum', 'default')
+
+# ------------------------------------------------------------------------------------------------------------
+# StringPool
+
+# Shared strings and tuples, so equal values are only stored once across many plugins
+# Tuples are compared by the exact type of each item, so (1, "x") and (1.0, "x") are never merged.
+class StringPool(object):
+    def __init__(self):
+        self._strings = {}
+        self._tuples  = {}
+
+    def __len__(self):
+        return len(self._strings) + len(self._tuples)
+
+    # Get the shared copy of a string, anything else is returned as-is
+    def get(self, value):
+        if value.__class__ is not str:
+            return value
+        return self._strings.setdefault(value, value)
+
+    # Get the shared tuple of @a values, strings inside are shared as well
+    def get_tuple(self, values):
+        values = tuple(self.get(value) for value in values)
+
+        # tuples inside are pooled already, their identity is enough
+        key = tuple((value.__class__, id(value) if value.__class__ is tuple else value) for value in values)
+
+        return self._tuples.setdefault(key, values)
+
+# ------------------------------------------------------------------------------------------------------------
+# PortRecord
+
+# Compact version of a single port of get_plugin_info
+# Ranges, units, properties and scale points are shared tuples, the port dict is rebuilt by to_dict.
+# Items can also be read as in the dict, for example record['symbol'] or record['ranges'].
+class PortRecord(object):
+    __slots__ = (
+        'name', 'symbol', '_ranges', '_units', 'comment', 'designation', '_properties', 'rangeSteps',
+        '_scalePoints', 'shortName', 'index',
+    )
+
+    KEYS = (
+        'name', 'symbol', 'ranges', 'units', 'comment', 'designation', 'properties', 'rangeSteps',
+        'scalePoints', 'shortName', 'index',
+    )
+
+    def __init__(self, port, pool):
+        get = pool.get
+
+        self.name        = get(port['name'])
+        self.symbol      = get(port['symbol'])
+        self.comment     = get(port['comment'])
+        self.designation = get(port['designation'])
+        self.rangeSteps  = get(port['rangeSteps'])
+        self.shortName   = get(port['shortName'])
+        self.index       = port['index']
+
+        ranges = port['ranges']
+
+        # ranges are either empty or have all 3 values, anything else is kept as-is
+        if len(ranges) == 0:
+            self._ranges = None
+        elif tuple(ranges.keys()) == RANGE_KEYS:
+            self._ranges = pool.get_tuple(ranges[key] for key in RANGE_KEYS)
+        else:
+            self._ranges = dict(ranges)
+
+        units = port['units']
+        self._units = pool.get_tuple((units['label'], units['render'], units['symbol'])) if units else None
+
+        self._properties  = pool.get_tuple(port['properties'])
+        self._scalePoints = pool.get_tuple(pool.get_tuple((scalepoint['value'], scalepoint['label']))
+                                           for scalepoint in port['scalePoints'])
+
+    @property
+    def ranges(self):
+        if self._ranges is None:
+            return {}
+        if self._ranges.__class__ is dict:
+            return dict(self._ranges)
+        return dict(zip(RANGE_KEYS, self._ranges))
+
+    @property
+    def units(self):
+        if self._units is None:
+            return {}
+        label, render, symbol = self._units
+        return { 'label': label, 'render': render, 'symbol': symbol }
+
+    @property
+    def properties(self):
+        return list(self._properties)
+
+    @property
+    def scalePoints(self):
+        return [{ 'value': value, 'label': label } for value, label in self._scalePoints]
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if isinstance(other, PortRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def keys(self):
+        return list(self.KEYS)
+
+    # Convert into the exact same dict get_plugin_info returns
+    def to_dict(self):
+        return dict((key, getattr(self, key)) for key in self.KEYS)
+
+# ------------------------------------------------------------------------------------------------------------
+# compact_plugin_info
+
+# Get a compact version of the info of a plugin (as from get_plugin_info)
+# Ports become PortRecord objects, repeated strings and string lists are shared through @a pool.
+# The result keeps the same keys, but lists are tuples and ports can't be changed in place; it can be used
+# for lookups and filters (as in PluginCatalog), use expand_plugin_info to get the regular dict back.
+# @a pool is a StringPool, use the same one for all plugins of a catalog.
+def compact_plugin_info(info, pool = None):
+    if pool is None:
+        pool = StringPool()
+
+    compact = dict(info)
+
+    for key in PLUGIN_STRINGS:
+        if key in compact:
+            compact[key] = pool.get(compact[key])
+
+    for key in PLUGIN_STRING_LISTS:
+        if key in compact:
+            compact[key] = pool.get_tuple(compact[key])
+
+    if 'author' in compact:
+        compact['author'] = dict((key, pool.get(value)) for key, value in compact['author'].items())
+
+    if 'ports' in compact:
+        compact['ports'] = dict((typ, dict((direction, tuple(PortRecord(port, pool) for port in ports))
+                                           for direction, ports in dirs.items()))
+                                for typ, dirs in compact['ports'].items())
+
+    return compact
+
+# Get the same dict get_plugin_info returned, from the result of compact_plugin_info
+def expand_plugin_info(compact):
+    info = dict(compact)
+
+    for key in PLUGIN_STRING_LISTS:
+        if key in info:
+            info[key] = list(info[key])
+
+    if 'author' in info:
+        info['author'] = dict(info['author'])
+
+    if 'ports' in info:
+        info['ports'] = dict((typ, dict((direction, [port.to_dict() for port in ports])
+                                        for direction, ports in dirs.items()))
+                             for typ, dirs in info['ports'].items())
+
+    return info
+
+# ------------------------------------------------------------------------------------------------------------
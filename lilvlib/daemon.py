@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import sys
+import threading
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+# Requests and responses are JSON objects, one per line:
+#   request : { "method": name, "params": { ... } }
+#   response: { "result": value } or { "error": message }
+#
+# Methods:
+#   ping                                  -> "pong"
+#   plugins                               -> info of all plugins, sorted by uri
+#   plugin_info      { "uri" }            -> info of a single plugin
+#   rescan           { "bundles" }        -> list of { "event", "uri" } changes, bundles is optional
+#   pedalboard_info  { "bundle" }         -> same as get_pedalboard_info
+#   pedalboard_name  { "bundle" }         -> same as get_pedalboard_name
+#   pedalboards_list { "bundles" }        -> same as get_pedalboards_list
+
+# ------------------------------------------------------------------------------------------------------------
+# get_socket_path
+
+# Get the default socket path, inside the user runtime dir when available
+def get_socket_path():
+    rundir = os.getenv("XDG_RUNTIME_DIR")
+
+    if rundir and os.path.isdir(rundir):
+        return os.path.join(rundir, "lilvlib.sock")
+
+    return "/tmp/lilvlib-%i.sock" % os.getuid()
+
+# ------------------------------------------------------------------------------------------------------------
+# LilvDaemon
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                request  = json.loads(line.decode("utf-8"))
+                response = { 'result': self.server.daemon.call(request['method'], request.get('params', {})) }
+            except Exception as e:
+                response = { 'error': str(e) }
+
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    # each client connection gets its own thread, requests are passed to the lilv thread (see LilvDaemon.call)
+    allow_reuse_address = True
+    daemon_threads      = True
+
+# Long-running scan service with a warm lilv world and plugin catalog
+# Answers JSON requests over a Unix socket, see above for the protocol.
+# Clients are served concurrently, but requests are run one at a time on the thread that called serve_forever,
+# so the lilv world is only ever used from that thread.
+# @a paths are the LV2 directories of the catalog, defaults to the LV2 path.
+class LilvDaemon(object):
+    def __init__(self, path = None, paths = None):
+        from lilvlib.watch import IncrementalCatalog
+
+        self.path    = path if path is not None else get_socket_path()
+        self.catalog = IncrementalCatalog(paths)
+        self.server  = None
+
+        # pending requests, as (method, params, reply queue)
+        self.requests = queue.Queue()
+        self.closing  = False
+
+    @property
+    def manager(self):
+        return self.catalog.manager
+
+    # Handle a single request, returns its result or raises on errors
+    def handle(self, method, params):
+        from lilvlib.lilvlib import (
+            get_bundle_path, get_pedalboard_info, get_pedalboard_name, get_pedalboards_list
+        )
+
+        if method == "ping":
+            return "pong"
+
+        if method == "plugins":
+            return [self.catalog.plugins[uri] for uri in sorted(self.catalog.plugins)]
+
+        if method == "plugin_info":
+            uri = params['uri']
+            if uri not in self.catalog.plugins:
+                raise Exception('plugin_info(%s) - plugin not found' % uri)
+            return self.catalog.plugins[uri]
+
+        if method == "rescan":
+            bundles = params.get('bundles', None)
+            if bundles is not None:
+                bundles = set(get_bundle_path(bundle) for bundle in bundles)
+            return [{ 'event': event, 'uri': uri } for event, uri, info in self.catalog.update(bundles)]
+
+        if method == "pedalboard_info":
+            return get_pedalboard_info(params['bundle'], self.manager)
+
+        if method == "pedalboard_name":
+            return get_pedalboard_name(params['bundle'], self.manager)
+
+        if method == "pedalboards_list":
+            return get_pedalboards_list(params['bundles'], self.manager)
+
+        raise Exception('handle(%s) - unknown method' % method)
+
+    # Same as handle, from any thread: the request is run by the serving thread and its result waited for
+    def call(self, method, params):
+        reply = queue.Queue(1)
+        self.requests.put((method, params, reply))
+
+        while True:
+            try:
+                ok, result = reply.get(timeout=0.5)
+                break
+            except queue.Empty:
+                if self.server is None:
+                    raise Exception('call(%s) - daemon closed' % method)
+
+        if not ok:
+            raise result
+
+        return result
+
+    # Scan everything and serve requests until close is called
+    def serve_forever(self):
+        self.catalog.scan()
+
+        # remove a stale socket from an earlier run
+        try:
+            if stat.S_ISSOCK(os.stat(self.path).st_mode):
+                os.unlink(self.path)
+        except OSError:
+            pass
+
+        umask = os.umask(0o077)
+        try:
+            self.server = _Server(self.path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+        self.server.daemon = self
+        self.closing = False
+
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        try:
+            # lilv requests are run here, the flag is checked between them
+            while not self.closing:
+                try:
+                    method, params, reply = self.requests.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                try:
+                    reply.put((True, self.handle(method, params)))
+                except Exception as e:
+                    reply.put((False, e))
+        finally:
+            self.server.shutdown()
+            thread.join()
+            self.server.server_close()
+            self.server = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    # Stop serving, serve_forever returns after the current request
+    # Only sets a flag, so it is safe to call from any thread and from signal handlers.
+    def close(self):
+        self.closing = True
+
+# ------------------------------------------------------------------------------------------------------------
+# LilvClient
+
+# Thin client for LilvDaemon, one round trip per request instead of a cold lilv world per process
+class LilvClient(object):
+    def __init__(self, path = None, timeout = None):
+        self.path = path if path is not None else get_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(self.path)
+        self.rfile = self.sock.makefile('rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.sock is not None:
+            self.rfile.close()
+            self.sock.close()
+            self.sock = None
+
+    # Send a request and wait for its result, raises if the daemon replied with an error
+    def request(self, method, **params):
+        self.sock.sendall(json.dumps({ 'method': method, 'params': params }).encode("utf-8") + b"\n")
+
+        line = self.rfile.readline()
+
+        if not line:
+            raise Exception('request(%s) - connection closed by the daemon' % method)
+
+        response = json.loads(line.decode("utf-8"))
+
+        if 'error' in response:
+            raise Exception(response['error'])
+
+        return response['result']
+
+    def ping(self):
+        return self.request("ping")
+
+    def get_plugins_info(self):
+        return self.request("plugins")
+
+    def get_plugin_info(self, uri):
+        return self.request("plugin_info", uri=uri)
+
+    def rescan(self, bundles = None):
+        if bundles is None:
+            return self.request("rescan")
+        return self.request("rescan", bundles=list(bundles))
+
+    def get_pedalboard_info(self, bundle):
+        return self.request("pedalboard_info", bundle=bundle)
+
+    def get_pedalboard_name(self, bundle):
+        return self.request("pedalboard_name", bundle=bundle)
+
+    def get_pedalboards_list(self, bundles):
+        return self.request("pedalboards_list", bundles=list(bundles))
+
+# ------------------------------------------------------------------------------------------------------------
+
+# Run the daemon until interrupted
+# Usage: python3 -m lilvlib.daemon [--socket PATH] [LV2 directories...]
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="lilvlib scan daemon")
+    parser.add_argument("--socket", default=None, help="socket path (default: %s)" % get_socket_path())
+    parser.add_argument("paths", nargs="*", help="LV2 directories (default: LV2_PATH)")
+    args = parser.parse_args()
+
+    daemon = LilvDaemon(args.socket, args.paths or None)
+
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# ------------------------------------------------------------------------------------------------------------
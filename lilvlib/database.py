@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import json
+import os
+import re
+import sqlite3
+
+from lilvlib.cache import get_bundle_fingerprint
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+# bump this whenever the tables change, older databases are recreated
+DATABASE_VERSION = 2
+
+DATABASE_SCHEMA = """
+CREATE TABLE bundles (
+    id          INTEGER PRIMARY KEY,
+    path        TEXT NOT NULL UNIQUE,
+    fingerprint TEXT NOT NULL,
+    variant     TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE plugins (
+    id            INTEGER PRIMARY KEY,
+    bundle_id     INTEGER NOT NULL REFERENCES bundles(id) ON DELETE CASCADE,
+    uri           TEXT NOT NULL,
+    name          TEXT,
+    binary        TEXT,
+    brand         TEXT,
+    label         TEXT,
+    license       TEXT,
+    comment       TEXT,
+    micro_version INTEGER,
+    minor_version INTEGER,
+    version       TEXT,
+    stability     TEXT,
+    author_name   TEXT,
+    author_email  TEXT,
+    author_url    TEXT,
+    errors        INTEGER NOT NULL,
+    warnings      INTEGER NOT NULL,
+    data          TEXT NOT NULL,
+    UNIQUE (bundle_id, uri)
+);
+
+CREATE TABLE plugin_categories (
+    plugin_id INTEGER NOT NULL REFERENCES plugins(id) ON DELETE CASCADE,
+    category  TEXT NOT NULL
+);
+
+CREATE TABLE ports (
+    id            INTEGER PRIMARY KEY,
+    plugin_id     INTEGER NOT NULL REFERENCES plugins(id) ON DELETE CASCADE,
+    port_index    INTEGER NOT NULL,
+    direction     TEXT NOT NULL,
+    symbol        TEXT NOT NULL,
+    name          TEXT,
+    short_name    TEXT,
+    comment       TEXT,
+    designation   TEXT,
+    range_steps   TEXT,
+    minimum       REAL,
+    maximum       REAL,
+    default_value REAL,
+    unit_label    TEXT,
+    unit_render   TEXT,
+    unit_symbol   TEXT
+);
+
+CREATE TABLE port_types (
+    port_id INTEGER NOT NULL REFERENCES ports(id) ON DELETE CASCADE,
+    type    TEXT NOT NULL
+);
+
+CREATE TABLE port_properties (
+    port_id  INTEGER NOT NULL REFERENCES ports(id) ON DELETE CASCADE,
+    property TEXT NOT NULL
+);
+
+CREATE TABLE scale_points (
+    port_id INTEGER NOT NULL REFERENCES ports(id) ON DELETE CASCADE,
+    value   REAL NOT NULL,
+    label   TEXT NOT NULL
+);
+
+CREATE TABLE presets (
+    plugin_id INTEGER NOT NULL REFERENCES plugins(id) ON DELETE CASCADE,
+    uri       TEXT NOT NULL,
+    label     TEXT NOT NULL
+);
+
+CREATE TABLE modguis (
+    plugin_id           INTEGER PRIMARY KEY REFERENCES plugins(id) ON DELETE CASCADE,
+    resources_directory TEXT,
+    icon_template       TEXT,
+    settings_template   TEXT,
+    javascript          TEXT,
+    stylesheet          TEXT,
+    screenshot          TEXT,
+    thumbnail           TEXT,
+    brand               TEXT,
+    label               TEXT,
+    model               TEXT,
+    panel               TEXT,
+    color               TEXT,
+    knob                TEXT
+);
+
+CREATE TABLE modgui_ports (
+    plugin_id  INTEGER NOT NULL REFERENCES plugins(id) ON DELETE CASCADE,
+    port_index INTEGER NOT NULL,
+    symbol     TEXT NOT NULL,
+    name       TEXT NOT NULL
+);
+
+CREATE INDEX plugins_bundle            ON plugins(bundle_id);
+CREATE INDEX plugins_uri               ON plugins(uri);
+CREATE INDEX plugins_brand             ON plugins(brand);
+CREATE INDEX plugins_author            ON plugins(author_name);
+CREATE INDEX plugins_stability         ON plugins(stability);
+CREATE INDEX plugin_categories_plugin  ON plugin_categories(plugin_id);
+CREATE INDEX plugin_categories_name    ON plugin_categories(category);
+CREATE INDEX ports_plugin              ON ports(plugin_id, port_index);
+CREATE INDEX ports_symbol              ON ports(symbol);
+CREATE INDEX ports_designation         ON ports(designation);
+CREATE INDEX port_types_port           ON port_types(port_id);
+CREATE INDEX port_types_type           ON port_types(type, port_id);
+CREATE INDEX port_properties_port      ON port_properties(port_id);
+CREATE INDEX port_properties_property  ON port_properties(property, port_id);
+CREATE INDEX scale_points_port         ON scale_points(port_id);
+CREATE INDEX presets_plugin            ON presets(plugin_id);
+CREATE INDEX presets_uri               ON presets(uri);
+CREATE INDEX modgui_ports_plugin       ON modgui_ports(plugin_id);
+"""
+
+# tables created by DATABASE_SCHEMA, in creation order
+DATABASE_TABLES = tuple(re.findall(r"^CREATE TABLE (\w+)", DATABASE_SCHEMA, re.M))
+
+# gui keys -> modguis columns
+_MODGUI_COLUMNS = (
+    ('resourcesDirectory', 'resources_directory'),
+    ('iconTemplate',       'icon_template'),
+    ('settingsTemplate',   'settings_template'),
+    ('javascript',         'javascript'),
+    ('stylesheet',         'stylesheet'),
+    ('screenshot',         'screenshot'),
+    ('thumbnail',          'thumbnail'),
+    ('brand',              'brand'),
+    ('label',              'label'),
+    ('model',              'model'),
+    ('panel',              'panel'),
+    ('color',              'color'),
+    ('knob',               'knob'),
+)
+
+# ------------------------------------------------------------------------------------------------------------
+# PluginDatabase
+
+# SQLite catalog of get_plugins_info results
+# Plugins, ports, scale points, presets and modgui data go into normalized, indexed tables, and the full info of each
+# plugin is kept too so it can be returned exactly as get_plugin_info gave it.
+# Data is stored per bundle together with its fingerprint. A plugin installed in several bundles is stored once for
+# each of them, so every bundle keeps its own cached data; lookups and queries use the most recently stored one. This makes the database usable as the @a cache of
+# get_plugins_info and iter_plugins_info, so that only modified bundles are scanned and rewritten (see sync).
+# @a filename is the database file, ":memory:" keeps everything in memory.
+# Databases of an older version are recreated, files with other tables raise an exception instead.
+class PluginDatabase(object):
+    def __init__(self, filename = ":memory:", hashContents = False):
+        self.filename     = filename
+        self.hashContents = hashContents
+        self.hits   = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+        if version != DATABASE_VERSION:
+            self._create()
+
+    # Create the tables, replacing those of an older version
+    # Files with tables that are not ours are never touched, in case the wrong file was given.
+    def _create(self):
+        tables  = [row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        unknown = [table for table in tables if table not in DATABASE_TABLES and not table.startswith("sqlite_")]
+
+        if len(unknown) != 0:
+            self.conn.close()
+            self.conn = None
+            raise Exception('PluginDatabase(%s) - not a plugin database, unknown tables: %s' % (self.filename,
+                                                                                             ", ".join(unknown)))
+
+        with self.conn:
+            # dependent tables go first, so foreign keys are never left dangling
+            for table in reversed(DATABASE_TABLES):
+                if table in tables:
+                    self.conn.execute("DROP TABLE %s" % table)
+
+            self.conn.executescript(DATABASE_SCHEMA)
+            self.conn.execute("PRAGMA user_version = %i" % DATABASE_VERSION)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(DISTINCT uri) FROM plugins").fetchone()[0]
+
+    def __contains__(self, uri):
+        return self.conn.execute("SELECT 1 FROM plugins WHERE uri = ?", (uri,)).fetchone() is not None
+
+    # ----------------------------------------------------------------------------------------------------
+    # cache interface, see PluginInfoCache
+
+    def fingerprint(self, bundle):
+        return get_bundle_fingerprint(bundle, self.hashContents)
+
+    # Get the stored plugins of a bundle, or None if the bundle is unknown or changed
+    def get(self, bundle, fingerprint, variant = ""):
+        row = self.conn.execute("SELECT id, fingerprint, variant FROM bundles WHERE path = ?", (bundle,)).fetchone()
+
+        if row is None or not fingerprint or row[1] != fingerprint or row[2] != variant:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return [json.loads(data) for data, in self.conn.execute("SELECT data FROM plugins WHERE bundle_id = ? "
+                                                                 "ORDER BY uri", (row[0],))]
+
+    # Replace everything stored for a bundle, in a single transaction
+    def put(self, bundle, fingerprint, plugins, variant = ""):
+        with self.conn:
+            self.conn.execute("DELETE FROM bundles WHERE path = ?", (bundle,))
+
+            bundleid = self.conn.execute("INSERT INTO bundles (path, fingerprint, variant) VALUES (?, ?, ?)",
+                                         (bundle, fingerprint, variant)).lastrowid
+
+            for info in plugins:
+                self._insert_plugin(bundleid, info)
+
+    def invalidate(self, bundle = None):
+        with self.conn:
+            if bundle is None:
+                self.conn.execute("DELETE FROM bundles")
+            else:
+                self.conn.execute("DELETE FROM bundles WHERE path = ?", (bundle,))
+
+    def reset_stats(self):
+        self.hits   = 0
+        self.misses = 0
+
+    # changes are committed right away, nothing to do here
+    def save(self):
+        pass
+
+    # ----------------------------------------------------------------------------------------------------
+    # updates
+
+    # Bring the database up to date with a list of bundles
+    # Only bundles that changed since the last sync are scanned and rewritten, bundles stored before but not in
+    # @a bundles anymore are removed. Extra arguments are passed to iter_plugins_info.
+    # Returns the number of scanned groups of bundles (bundles that share plugins are scanned together).
+    def sync(self, bundles, **kwargs):
+        from lilvlib.lilvlib import get_bundle_path, iter_plugins_info
+
+        bundles = [get_bundle_path(bundle) for bundle in bundles]
+        current = set(bundles)
+
+        with self.conn:
+            for bundle, in self.conn.execute("SELECT path FROM bundles").fetchall():
+                if bundle not in current:
+                    self.conn.execute("DELETE FROM bundles WHERE path = ?", (bundle,))
+
+        if len(bundles) == 0:
+            return 0
+
+        misses = self.misses
+
+        for info in iter_plugins_info(bundles, cache=self, **kwargs):
+            pass
+
+        return self.misses - misses
+
+    def remove_bundle(self, bundle):
+        self.invalidate(os.path.abspath(bundle) + os.sep)
+
+    def _insert_plugin(self, bundleid, info):
+        conn   = self.conn
+        author = info['author']
+
+        pluginid = conn.execute("INSERT INTO plugins (bundle_id, uri, name, binary, brand, label, license, comment, "
+                                "micro_version, minor_version, version, stability, author_name, author_email, "
+                                "author_url, errors, warnings, data) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                                bundleid, info['uri'], info['name'], info['binary'], info['brand'], info['label'],
+                                info['license'], info['comment'], info['microVersion'], info['minorVersion'],
+                                info['version'], info['stability'], author.get('name', ""), author.get('email', ""),
+                                author.get('homepage', ""), len(info['errors']), len(info['warnings']),
+                                json.dumps(info))).lastrowid
+
+        conn.executemany("INSERT INTO plugin_categories (plugin_id, category) VALUES (?, ?)",
+                         [(pluginid, category) for category in info['category']])
+
+        # ports are listed once per type, store each one only once
+        ports = {}
+
+        for typ, dirs in info['ports'].items():
+            for direction, portlist in dirs.items():
+                for port in portlist:
+                    key = (port['index'], direction)
+                    if key in ports:
+                        ports[key][1].append(typ)
+                    else:
+                        ports[key] = (port, [typ])
+
+        for (index, direction), (port, types) in sorted(ports.items()):
+            ranges = port['ranges']
+            units  = port['units']
+
+            portid = conn.execute("INSERT INTO ports (plugin_id, port_index, direction, symbol, name, short_name, "
+                                  "comment, designation, range_steps, minimum, maximum, default_value, "
+                                  "unit_label, unit_render, unit_symbol) "
+                                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                                  pluginid, index, direction, port['symbol'], port['name'], port['shortName'],
+                                  port['comment'], port['designation'], port['rangeSteps'],
+                                  ranges.get('minimum', None), ranges.get('maximum', None),
+                                  ranges.get('default', None), units.get('label', None),
+                                  units.get('render', None), units.get('symbol', None))).lastrowid
+
+            conn.executemany("INSERT INTO port_types (port_id, type) VALUES (?, ?)",
+                             [(portid, typ) for typ in types])
+            conn.executemany("INSERT INTO port_properties (port_id, property) VALUES (?, ?)",
+                             [(portid, prop) for prop in port['properties']])
+            conn.executemany("INSERT INTO scale_points (port_id, value, label) VALUES (?, ?, ?)",
+                             [(portid, sp['value'], sp['label']) for sp in port['scalePoints']])
+
+        conn.executemany("INSERT INTO presets (plugin_id, uri, label) VALUES (?, ?, ?)",
+                         [(pluginid, preset['uri'], preset['label']) for preset in info['presets']])
+
+        gui = info['gui']
+
+        if gui:
+            conn.execute("INSERT INTO modguis (plugin_id, %s) VALUES (?%s)" % (
+                         ", ".join(column for key, column in _MODGUI_COLUMNS), ", ?" * len(_MODGUI_COLUMNS)),
+                         [pluginid] + [gui.get(key, None) for key, column in _MODGUI_COLUMNS])
+
+            conn.executemany("INSERT INTO modgui_ports (plugin_id, port_index, symbol, name) VALUES (?, ?, ?, ?)",
+                             [(pluginid, port['index'], port['symbol'], port['name'])
+                              for port in gui.get('ports', [])])
+
+    # ----------------------------------------------------------------------------------------------------
+    # queries
+
+    # Get the info of a plugin, exactly as get_plugin_info gave it, or None if unknown
+    # If the plugin is in several bundles, the most recently stored one is returned.
+    def get_plugin(self, uri):
+        row = self.conn.execute("SELECT data FROM plugins WHERE uri = ? ORDER BY id DESC LIMIT 1", (uri,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    # Get the uris of the plugins stored for a bundle
+    def get_bundle_plugins(self, bundle):
+        return [uri for uri, in self.conn.execute("SELECT plugins.uri FROM plugins "
+                                                  "JOIN bundles ON bundles.id = plugins.bundle_id "
+                                                  "WHERE bundles.path = ? ORDER BY plugins.uri",
+                                                  (os.path.abspath(bundle) + os.sep,))]
+
+    # Get the uris of the plugins matching every given condition, sorted
+    # @a category, @a portType and @a portProperty match plugins having at least one such category, port type or
+    # port property. @a ports is a dict of (type, direction) -> minimum number of such ports.
+    def find_plugins(self, brand = None, author = None, stability = None, category = None, portType = None,
+                     portProperty = None, ports = None):
+        # the newest copy of each plugin, see get_plugin
+        where  = ["plugins.id IN (SELECT MAX(id) FROM plugins GROUP BY uri)"]
+        params = []
+
+        if brand is not None:
+            where.append("plugins.brand = ?")
+            params.append(brand)
+
+        if author is not None:
+            where.append("plugins.author_name = ?")
+            params.append(author)
+
+        if stability is not None:
+            where.append("plugins.stability = ?")
+            params.append(stability)
+
+        if category is not None:
+            where.append("plugins.id IN (SELECT plugin_id FROM plugin_categories WHERE category = ?)")
+            params.append(category)
+
+        if portType is not None:
+            where.append("plugins.id IN (SELECT ports.plugin_id FROM port_types "
+                         "JOIN ports ON ports.id = port_types.port_id WHERE port_types.type = ?)")
+            params.append(portType)
+
+        if portProperty is not None:
+            where.append("plugins.id IN (SELECT ports.plugin_id FROM port_properties "
+                         "JOIN ports ON ports.id = port_properties.port_id WHERE port_properties.property = ?)")
+            params.append(portProperty)
+
+        if ports is not None:
+            for (typ, direction), count in ports.items():
+                where.append("(SELECT COUNT(*) FROM ports JOIN port_types ON port_types.port_id = ports.id "
+                             "WHERE ports.plugin_id = plugins.id AND port_types.type = ? AND ports.direction = ?) >= ?")
+                params.extend((typ, direction, count))
+
+        sql = "SELECT plugins.uri FROM plugins WHERE " + " AND ".join(where) + " ORDER BY plugins.uri"
+
+        return [uri for uri, in self.conn.execute(sql, params)]
+
+    # Run any read query over the tables, returns a list of rows
+    # Writes are refused by sqlite (PRAGMA query_only), raising sqlite3.OperationalError.
+    def query(self, sql, params = ()):
+        self.conn.execute("PRAGMA query_only = ON")
+
+        try:
+            return self.conn.execute(sql, params).fetchall()
+        finally:
+            # a refused write still leaves its implicit transaction open
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            self.conn.execute("PRAGMA query_only = OFF")
+
+# ------------------------------------------------------------------------------------------------------------
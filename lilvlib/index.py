@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import os
+
+from lilvlib.ttl import RDF_TYPE, TtlError, parse_ttl_file
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+LV2_PLUGIN     = "http://lv2plug.in/ns/lv2core#Plugin"
+LV2_APPLIES_TO = "http://lv2plug.in/ns/lv2core#appliesTo"
+
+# same default as lilv on unix systems, in the same order (it decides which copy of a duplicated bundle is used)
+LV2_DEFAULT_PATH = "~/.lv2:/usr/lib/lv2:/usr/local/lib/lv2"
+
+# ------------------------------------------------------------------------------------------------------------
+# get_lv2_path
+
+# Get the list of LV2 directories, as used by lilv's load_all
+def get_lv2_path():
+    lv2path = os.getenv("LV2_PATH") or LV2_DEFAULT_PATH
+    return [os.path.expanduser(path) for path in lv2path.split(os.pathsep) if path]
+
+# ------------------------------------------------------------------------------------------------------------
+# get_lv2_bundles
+
+# Get all bundles inside some LV2 directories
+# @a paths is a list of directories, defaults to the LV2 path.
+def get_lv2_bundles(paths = None):
+    if paths is None:
+        paths = get_lv2_path()
+
+    bundles = []
+
+    for path in paths:
+        if not os.path.isdir(path):
+            continue
+
+        for name in sorted(os.listdir(path)):
+            bundle = os.path.join(path, name)
+            if os.path.exists(os.path.join(bundle, "manifest.ttl")):
+                bundles.append(os.path.abspath(bundle) + os.sep)
+
+    return bundles
+
+# ------------------------------------------------------------------------------------------------------------
+# get_manifest_plugins
+
+# Get the URIs of all plugins a bundle declares or extends, by reading its manifest only
+# This includes plugins that have presets in the bundle.
+def get_manifest_plugins(bundle):
+    plugins = []
+
+    try:
+        for subj, pred, obj in parse_ttl_file(os.path.join(bundle, "manifest.ttl")):
+            if pred == RDF_TYPE and obj == LV2_PLUGIN:
+                uri = subj
+            elif pred == LV2_APPLIES_TO and isinstance(obj, str):
+                uri = obj
+            else:
+                continue
+
+            if uri not in plugins:
+                plugins.append(uri)
+
+    except TtlError:
+        pass
+
+    return plugins
+
+# ------------------------------------------------------------------------------------------------------------
+# PluginIndex
+
+# Index of plugin URI -> bundles, built from the bundle manifests
+# Used to load only the bundles needed for a single plugin instead of the whole LV2 path.
+class PluginIndex(object):
+    def __init__(self, paths = None):
+        self.paths   = paths
+        self.plugins = None
+
+    def refresh(self):
+        self.plugins = {}
+
+        for bundle in get_lv2_bundles(self.paths):
+            for uri in get_manifest_plugins(bundle):
+                try:
+                    self.plugins[uri].append(bundle)
+                except KeyError:
+                    self.plugins[uri] = [bundle]
+
+    # Get the bundles that define a plugin, or an empty list if unknown
+    def lookup(self, uri):
+        if self.plugins is None:
+            self.refresh()
+
+        # ignore bundles removed since the last refresh
+        return [bundle for bundle in self.plugins.get(uri, []) if os.path.isdir(bundle)]
+
+# ------------------------------------------------------------------------------------------------------------
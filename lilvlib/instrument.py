@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import sys
+import time
+
+from contextlib import contextmanager
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+# builtin functions that touch the filesystem
+FS_CALLS = ("stat", "lstat", "access", "open", "listdir", "scandir")
+
+# modules of the lilv bindings
+LILV_MODULES = ("lilv", "_lilv")
+
+# classes of the lilv bindings, SWIG names their methods as Class_method
+LILV_CLASSES = (
+    "World", "Plugin", "Plugins", "PluginClass", "PluginClasses", "Port", "Node", "Nodes", "ScalePoint",
+    "ScalePoints", "UI", "UIs", "Instance", "State",
+)
+
+# lilv functions and wrapper methods that query the model (everything else is node/collection handling)
+LILV_QUERY_CALLS = (
+    "lilv_world_find_nodes", "lilv_world_get", "lilv_world_ask", "lilv_world_load_resource",
+    "lilv_plugin_get_value", "lilv_plugin_get_related", "lilv_port_get_value", "lilv_port_get_scale_points",
+    "World.find_nodes", "World.get", "World.ask", "World.load_resource",
+    "Plugin.get_value", "Plugin.get_related", "Port.get_value", "Port.get_scale_points",
+)
+
+# ------------------------------------------------------------------------------------------------------------
+# ScanInstrument
+
+# Collects per-plugin, per-phase timings and call counts of get_plugin_info
+# Pass one to get_plugin_info or get_plugins_info, without it nothing is measured and nothing is slower.
+# Calls are counted with a profile hook, both lilv_* functions and methods of the binding classes (as
+# "Class.method"). Only the outermost lilv call is counted, not what a wrapper method calls in turn.
+#
+# records is a dict of plugin uri -> {
+#   'bundle': path,
+#   'time'  : total seconds,
+#   'phases': { phase: { 'time': seconds, 'lilv': lilv calls, 'queries': lilv queries, 'fs': filesystem calls } },
+#   'calls' : { function name: count },
+# }
+class ScanInstrument(object):
+    def __init__(self, countCalls = True):
+        self.countCalls = countCalls
+        self.records    = {}
+        self._record    = None
+        self._phase     = None
+        self._prevprof  = None
+        self._lilvfile  = None
+        self._depth     = 0
+
+    # ----------------------------------------------------------------------------------------------------
+    # recording, used by get_plugin_info
+
+    def begin(self, uri, bundle = ""):
+        self._record = {
+            'bundle': bundle,
+            'time'  : 0.0,
+            'phases': {},
+            'calls' : {},
+        }
+        self.records[uri] = self._record
+
+    def end(self):
+        self._record = None
+
+    @contextmanager
+    def phase(self, name):
+        record = self._record
+        phase  = record['phases'].setdefault(name, { 'time': 0.0, 'lilv': 0, 'queries': 0, 'fs': 0 })
+
+        self._phase = phase
+        self._depth = 0
+
+        if self.countCalls:
+            self._prevprof = sys.getprofile()
+            sys.setprofile(self._profile)
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            took = time.perf_counter() - start
+
+            if self.countCalls:
+                sys.setprofile(self._prevprof)
+                self._prevprof = None
+
+            self._phase = None
+
+            phase['time']  += took
+            record['time'] += took
+
+    def _profile(self, frame, event, arg):
+        # python wrappers of the bindings (SWIG shadow classes)
+        if event == 'call' or event == 'return':
+            if self._lilvfile is None:
+                self._lilvfile = getattr(sys.modules.get("lilv", None), "__file__", "") or ""
+                if self._lilvfile.endswith(".pyc"):
+                    self._lilvfile = self._lilvfile[:-1]
+
+            if frame.f_code.co_filename != self._lilvfile:
+                return
+
+            if event == 'return':
+                self._depth -= 1
+                return
+
+            self._depth += 1
+
+            if self._depth != 1:
+                return
+
+            owner = frame.f_locals.get('self', None)
+            name  = frame.f_code.co_name
+
+            if owner is not None:
+                name = "%s.%s" % (type(owner).__name__, name)
+
+            self._count_lilv(name)
+            return
+
+        if event != 'c_call' or self._depth != 0:
+            return
+
+        name = _get_lilv_call_name(arg)
+
+        if name is not None:
+            self._count_lilv(name)
+            return
+
+        name = getattr(arg, "__name__", "")
+
+        if name not in FS_CALLS:
+            return
+
+        self._phase['fs'] += 1
+
+        calls = self._record['calls']
+        calls[name] = calls.get(name, 0) + 1
+
+    def _count_lilv(self, name):
+        self._phase['lilv'] += 1
+
+        if name in LILV_QUERY_CALLS:
+            self._phase['queries'] += 1
+
+        calls = self._record['calls']
+        calls[name] = calls.get(name, 0) + 1
+
+    # ----------------------------------------------------------------------------------------------------
+    # results
+
+    # Add the records of another instrument (for example from a worker process)
+    def merge(self, records):
+        self.records.update(records)
+
+    # Get the total time and counts per phase, for all plugins
+    def summary(self):
+        phases = {}
+
+        for record in self.records.values():
+            for name, phase in record['phases'].items():
+                total = phases.setdefault(name, { 'time': 0.0, 'lilv': 0, 'queries': 0, 'fs': 0 })
+                for key, value in phase.items():
+                    total[key] += value
+
+        return phases
+
+    # Get the @a count slowest plugins, as a list of (uri, record)
+    def slowest(self, count = 10):
+        return sorted(self.records.items(), key=lambda item: item[1]['time'], reverse=True)[:count]
+
+    # Get the @a count slowest bundles, as a list of (bundle, seconds)
+    def slowest_bundles(self, count = 10):
+        bundles = {}
+
+        for record in self.records.values():
+            bundles[record['bundle']] = bundles.get(record['bundle'], 0.0) + record['time']
+
+        return sorted(bundles.items(), key=lambda item: item[1], reverse=True)[:count]
+
+# ------------------------------------------------------------------------------------------------------------
+# _get_lilv_call_name
+
+# Get the name of a builtin lilv function or method, None for anything else
+# Methods are named as "Class.method", also when SWIG exposes them as flat Class_method functions.
+def _get_lilv_call_name(func):
+    name = getattr(func, "__name__", "")
+
+    if name.startswith("lilv_"):
+        return name
+
+    module = getattr(func, "__module__", None)
+    owner  = getattr(func, "__self__", None)
+
+    if module is None and owner is not None:
+        module = type(owner).__module__
+
+    if module not in LILV_MODULES:
+        return None
+
+    qualname = getattr(func, "__qualname__", name)
+
+    if "." in qualname:
+        return qualname
+
+    classname, sep, method = name.partition("_")
+
+    if sep and classname in LILV_CLASSES:
+        return "%s.%s" % (classname, method)
+
+    return name
+
+# ------------------------------------------------------------------------------------------------------------
@@ -7,9 +7,41 @@
 import json
 import lilv
 import os
+import weakref
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from math import fmod
 
+from lilvlib.index import PluginIndex, get_manifest_plugins
+from lilvlib.portdata import get_port_unit, get_short_port_name, is_integer
+from lilvlib.cache import get_group_fingerprint
+from lilvlib.category import get_categories
+from lilvlib.instrument import ScanInstrument
+from lilvlib.pedalboard import get_pedalboard_summary
+from lilvlib.ttl import TtlError
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+# ways of handling presets, see get_plugin_info
+PRESETS_MODES = ("full", "lazy", "none")
+
+# number of plugins whose preset files are loaded together while scanning, small enough to keep results streaming
+PRESETS_BATCH_SIZE = 16
+
+# ------------------------------------------------------------------------------------------------------------
+# Discard
+
+# List that ignores everything added to it, used in place of errors and warnings when not validating
+class _Discard(list):
+    __slots__ = ()
+
+    def append(self, item):
+        pass
+
+    def extend(self, items):
+        pass
+
 # ------------------------------------------------------------------------------------------------------------
 # Utilities
 
@@ -32,106 +64,150 @@ class NS(object):
             self._cache[attr] = lilv.Node(self.world.new_uri(self.base+attr))
         return self._cache[attr]
 
-def is_integer(string):
-    return string.strip().lstrip("-+").isdigit()
+# ------------------------------------------------------------------------------------------------------------
+# World nodes
+
+# Namespaces and nodes of a world, created once and shared by every call using that world
+# The world is only referenced weakly, so everything here goes away together with it.
+class _WorldNodes(object):
+    def __init__(self, world):
+        self.world      = weakref.proxy(world)
+        self.namespaces = {}
+        self.nodes      = {}
+
+        # unit uri -> (label, render, symbol, diagnostics), see get_unit
+        self.units = {}
+
+    def get_ns(self, base):
+        ns = self.namespaces.get(base, None)
+        if ns is None:
+            ns = self.namespaces[base] = NS(self.world, base)
+        return ns
+
+    def get_node(self, uri):
+        node = self.nodes.get(uri, None)
+        if node is None:
+            node = self.nodes[uri] = lilv.Node(self.world.new_uri(uri))
+        return node
+
+    # Get the (label, render, symbol, diagnostics) of a port unit, each unit uri is only resolved once
+    # diagnostics are (isError, message, args) tuples, the message takes the port name followed by args.
+    # @a uri is the unit uri, None for blank nodes (which are resolved every time).
+    # @a node is the lilv unit node, only used when the unit is not known yet.
+    def get_unit(self, uri, node):
+        unit = self.units.get(uri, None) if uri is not None else None
+
+        if unit is None:
+            unit = self._resolve_unit(uri, node)
+            if uri is not None:
+                self.units[uri] = unit
+
+        return unit
+
+    def _resolve_unit(self, uri, node):
+        ns_units = "http://lv2plug.in/ns/extensions/units#"
+
+        label  = ""
+        render = ""
+        symbol = ""
+        diagnostics = []
+
+        # using pre-existing lv2 unit
+        if uri is not None and uri.startswith("http://lv2plug.in/ns/"):
+            miniuri = uri.replace(ns_units,"",1)
+            alnum   = miniuri.isalnum()
+
+            if not alnum:
+                diagnostics.append((True, "port '%s' has wrong lv2 unit uri", ()))
+                miniuri = miniuri.rsplit("#",1)[-1].rsplit("/",1)[-1]
+
+            label, render, symbol = get_port_unit(miniuri)
+
+            if alnum and not (label and render and symbol):
+                diagnostics.append((True, "port '%s' has unknown lv2 unit (our bug?, data is '%s', '%s', '%s')",
+                                    (label, render, symbol)))
+
+        # using custom unit
+        else:
+            xlabel  = self.world.find_nodes(node, self.get_ns(lilv.LILV_NS_RDFS).label.me, None).get_first()
+            xrender = self.world.find_nodes(node, self.get_ns(ns_units).render.me, None).get_first()
+            xsymbol = self.world.find_nodes(node, self.get_ns(ns_units).symbol.me, None).get_first()
 
-def get_short_port_name(portName):
-    if len(portName) <= 16:
-        return portName
+            if xlabel.me is not None:
+                label = xlabel.as_string()
+            else:
+                diagnostics.append((True, "port '%s' has custom unit with no label", ()))
 
-    portName = portName.split("/",1)[0].split(" (",1)[0].split(" [",1)[0].strip()
+            if xrender.me is not None:
+                render = xrender.as_string()
+            else:
+                diagnostics.append((True, "port '%s' has custom unit with no render", ()))
 
-    # cut stuff if too big
-    if len(portName) > 16:
-        portName = portName[0] + portName[1:].replace("a","").replace("e","").replace("i","").replace("o","").replace("u","")
+            if xsymbol.me is not None:
+                symbol = xsymbol.as_string()
+            else:
+                diagnostics.append((True, "port '%s' has custom unit with no symbol", ()))
 
-        if len(portName) > 16:
-            portName = portName[:16]
+        return (label, render, symbol, tuple(diagnostics))
 
-    return portName.strip()
+# world -> _WorldNodes
+_world_nodes = weakref.WeakKeyDictionary()
 
-# ------------------------------------------------------------------------------------------------------------
+def _get_world_nodes(world):
+    try:
+        return _world_nodes[world]
+    except KeyError:
+        pass
 
-def get_category(nodes):
-    lv2_category_indexes = {
-        'DelayPlugin': ['Delay'],
-        'DistortionPlugin': ['Distortion'],
-        'WaveshaperPlugin': ['Distortion', 'Waveshaper'],
-        'DynamicsPlugin': ['Dynamics'],
-        'AmplifierPlugin': ['Dynamics', 'Amplifier'],
-        'CompressorPlugin': ['Dynamics', 'Compressor'],
-        'ExpanderPlugin': ['Dynamics', 'Expander'],
-        'GatePlugin': ['Dynamics', 'Gate'],
-        'LimiterPlugin': ['Dynamics', 'Limiter'],
-        'FilterPlugin': ['Filter'],
-        'AllpassPlugin': ['Filter', 'Allpass'],
-        'BandpassPlugin': ['Filter', 'Bandpass'],
-        'CombPlugin': ['Filter', 'Comb'],
-        'EQPlugin': ['Filter', 'Equaliser'],
-        'MultiEQPlugin': ['Filter', 'Equaliser', 'Multiband'],
-        'ParaEQPlugin': ['Filter', 'Equaliser', 'Parametric'],
-        'HighpassPlugin': ['Filter', 'Highpass'],
-        'LowpassPlugin': ['Filter', 'Lowpass'],
-        'GeneratorPlugin': ['Generator'],
-        'ConstantPlugin': ['Generator', 'Constant'],
-        'InstrumentPlugin': ['Generator', 'Instrument'],
-        'OscillatorPlugin': ['Generator', 'Oscillator'],
-        'ModulatorPlugin': ['Modulator'],
-        'ChorusPlugin': ['Modulator', 'Chorus'],
-        'FlangerPlugin': ['Modulator', 'Flanger'],
-        'PhaserPlugin': ['Modulator', 'Phaser'],
-        'ReverbPlugin': ['Reverb'],
-        'SimulatorPlugin': ['Simulator'],
-        'SpatialPlugin': ['Spatial'],
-        'SpectralPlugin': ['Spectral'],
-        'PitchPlugin': ['Spectral', 'Pitch Shifter'],
-        'UtilityPlugin': ['Utility'],
-        'AnalyserPlugin': ['Utility', 'Analyser'],
-        'ConverterPlugin': ['Utility', 'Converter'],
-        'FunctionPlugin': ['Utility', 'Function'],
-        'MixerPlugin': ['Utility', 'Mixer'],
-        #'MIDIPlugin': ['MIDI', 'Utility'],
-    }
-    mod_category_indexes = {
-        'DelayPlugin': ['Delay'],
-        'DistortionPlugin': ['Distortion'],
-        'DynamicsPlugin': ['Dynamics'],
-        'FilterPlugin': ['Filter'],
-        'GeneratorPlugin': ['Generator'],
-        'ModulatorPlugin': ['Modulator'],
-        'ReverbPlugin': ['Reverb'],
-        'SimulatorPlugin': ['Simulator'],
-        'SpatialPlugin': ['Spatial'],
-        'SpectralPlugin': ['Spectral'],
-        'UtilityPlugin': ['Utility'],
-        'MIDIPlugin': ['Utility', 'MIDI'],
-    }
+    nodes = _WorldNodes(world)
 
-    def fill_in_lv2_category(node):
-        category = node.as_string().replace("http://lv2plug.in/ns/lv2core#","")
-        if category in lv2_category_indexes.keys():
-            return lv2_category_indexes[category]
-        return []
+    try:
+        _world_nodes[world] = nodes
+    except TypeError:
+        # world can't be weakly referenced, nodes will live as long as the caller keeps them
+        nodes.world = world
 
-    def fill_in_mod_category(node):
-        category = node.as_string().replace("http://moddevices.com/ns/mod#","")
-        if category in mod_category_indexes.keys():
-            return mod_category_indexes[category]
-        return []
+    return nodes
 
-    categories = []
-    for cat in [cat for catlist in LILV_FOREACH(nodes, fill_in_mod_category) for cat in catlist]:
-        if cat not in categories:
-            categories.append(cat)
+# Get the namespace for @a base in a world, like NS but shared by all calls using the same world
+def get_world_ns(world, base):
+    return _get_world_nodes(world).get_ns(base)
 
-    if len(categories) > 0:
-        return categories
+# Get the lilv node for @a uri in a world, created only once per world
+def get_world_node(world, uri):
+    return _get_world_nodes(world).get_node(uri)
 
-    for cat in [cat for catlist in LILV_FOREACH(nodes, fill_in_lv2_category) for cat in catlist]:
-        if cat not in categories:
-            categories.append(cat)
+# Forget the resolved units of a world, needed after its bundles change
+def _clear_world_units(world):
+    try:
+        _world_nodes[world].units.clear()
+    except (KeyError, TypeError):
+        pass
 
-    return categories
+# Get the number of nodes created for a world so far, by get_world_ns and get_world_node
+# Nodes are only created the first time they are used, so this is the number of registry misses.
+def get_world_node_count(world):
+    try:
+        nodes = _world_nodes[world]
+    except (KeyError, TypeError):
+        return 0
+    return len(nodes.nodes) + sum(len(ns._cache) for ns in nodes.namespaces.values())
+
+# Free all namespaces, nodes and resolved units of a world right away, instead of waiting for the world to be
+# deleted. Also needed after loading or unloading bundles directly in the world, as unit definitions might change.
+def free_world_nodes(world):
+    try:
+        del _world_nodes[world]
+    except (KeyError, TypeError):
+        pass
+
+# ------------------------------------------------------------------------------------------------------------
+
+# Get the categories of a plugin from its class nodes, see lilvlib.category
+def get_category(nodes):
+    def fill_in_class(node):
+        return node.as_string()
+    return get_categories(LILV_FOREACH(nodes, fill_in_class))
 
 def get_port_data(port, subj):
     nodes = port.get_value(subj.me)
@@ -147,38 +223,6 @@ def get_port_data(port, subj):
 
     return data
 
-def get_port_unit(miniuri):
-  # using label, render, symbol
-  units = {
-      's': ["seconds", "%f s", "s"],
-      'ms': ["milliseconds", "%f ms", "ms"],
-      'min': ["minutes", "%f mins", "min"],
-      'bar': ["bars", "%f bars", "bars"],
-      'beat': ["beats", "%f beats", "beats"],
-      'frame': ["audio frames", "%f frames", "frames"],
-      'm': ["metres", "%f m", "m"],
-      'cm': ["centimetres", "%f cm", "cm"],
-      'mm': ["millimetres", "%f mm", "mm"],
-      'km': ["kilometres", "%f km", "km"],
-      'inch': ["inches", """%f\"""", "in"],
-      'mile': ["miles", "%f mi", "mi"],
-      'db': ["decibels", "%f dB", "dB"],
-      'pc': ["percent", "%f%%", "%"],
-      'coef': ["coefficient", "* %f", "*"],
-      'hz': ["hertz", "%f Hz", "Hz"],
-      'khz': ["kilohertz", "%f kHz", "kHz"],
-      'mhz': ["megahertz", "%f MHz", "MHz"],
-      'bpm': ["beats per minute", "%f BPM", "BPM"],
-      'oct': ["octaves", "%f octaves", "oct"],
-      'cent': ["cents", "%f ct", "ct"],
-      'semitone12TET': ["semitones", "%f semi", "semi"],
-      'degree': ["degrees", "%f deg", "deg"],
-      'midiNote': ["MIDI note", "MIDI note %d", "note"],
-  }
-  if miniuri in units.keys():
-      return units[miniuri]
-  return ("","","")
-
 # ------------------------------------------------------------------------------------------------------------
 # get_bundle_dirname
 
@@ -193,56 +237,132 @@ def get_bundle_dirname(bundleuri):
     return bundle
 
 # ------------------------------------------------------------------------------------------------------------
-# get_pedalboard_info
+# get_bundle_path
 
-# Get info from an lv2 bundle
-# @a bundle is a string, consisting of a directory in the filesystem (absolute pathname).
-def get_pedalboard_info(bundle):
+# Get a normalized bundle path, in the format lilv wants it
+def get_bundle_path(bundle):
     # lilv wants the last character as the separator
     bundle = os.path.abspath(bundle)
     if not bundle.endswith(os.sep):
         bundle += os.sep
 
-    # Create our own unique lilv world
-    # We'll load a single bundle and get all plugins from it
-    world = lilv.World()
+    return bundle
 
-    # this is needed when loading specific bundles instead of load_all
-    # (these functions are not exposed via World yet)
-    lilv.lilv_world_load_specifications(world.me)
-    lilv.lilv_world_load_plugin_classes(world.me)
+# ------------------------------------------------------------------------------------------------------------
+# WorldManager
+
+# Long-lived lilv world, specifications and plugin classes are only loaded once
+# Bundles are loaded and unloaded on demand, so the same world can be reused for many requests.
+class WorldManager(object):
+    def __init__(self):
+        self.world = lilv.World()
+
+        # this is needed when loading specific bundles instead of load_all
+        # (these functions are not exposed via World yet)
+        lilv.lilv_world_load_specifications(self.world.me)
+        lilv.lilv_world_load_plugin_classes(self.world.me)
+
+        # currently loaded bundles, as path -> bundle uri (as seen by lilv), and the reverse
+        self.bundles    = {}
+        self.bundleuris = {}
+
+    def is_loaded(self, bundle):
+        return get_bundle_path(bundle) in self.bundles
+
+    # Load a bundle, returns its normalized path
+    # Does nothing if the bundle is already loaded.
+    def load_bundle(self, bundle):
+        bundle = get_bundle_path(bundle)
+
+        if bundle in self.bundles:
+            return bundle
+
+        # convert bundle string into a lilv node
+        bundlenode = lilv.lilv_new_file_uri(self.world.me, None, bundle)
+
+        # load the bundle
+        self.world.load_bundle(bundlenode)
+        self.bundles[bundle] = lilv.lilv_node_as_uri(bundlenode)
+        self.bundleuris[self.bundles[bundle]] = bundle
+
+        # free bundlenode, no longer needed
+        lilv.lilv_node_free(bundlenode)
+
+        # the bundle might define units that were missing before
+        _clear_world_units(self.world)
+
+        return bundle
+
+    def unload_bundle(self, bundle):
+        bundle = get_bundle_path(bundle)
+
+        if bundle not in self.bundles:
+            return
+
+        bundlenode = lilv.lilv_new_file_uri(self.world.me, None, bundle)
+        lilv.lilv_world_unload_bundle(self.world.me, bundlenode)
+        lilv.lilv_node_free(bundlenode)
+
+        del self.bundleuris[self.bundles.pop(bundle)]
+
+        _clear_world_units(self.world)
+
+    # Reload a bundle that changed on disk
+    def reload_bundle(self, bundle):
+        self.unload_bundle(bundle)
+        return self.load_bundle(bundle)
+
+    # Get the plugins of some loaded bundles, in lilv order
+    # @a bundles is a list of bundle paths, None means all loaded bundles.
+    def get_plugins(self, bundles = None):
+        if bundles is None:
+            bundleuris = set(self.bundles.values())
+        else:
+            bundleuris = set(self.bundles[get_bundle_path(bundle)] for bundle in bundles)
 
-    # convert bundle string into a lilv node
-    bundlenode = lilv.lilv_new_file_uri(world.me, None, bundle)
+        return [p for p in self.world.get_all_plugins() if p.get_bundle_uri().as_string() in bundleuris]
 
-    # load the bundle
-    world.load_bundle(bundlenode)
+    # Get the bundle path a plugin belongs to, or None if not loaded via this manager
+    def get_plugin_bundle(self, plugin):
+        return self.bundleuris.get(plugin.get_bundle_uri().as_string(), None)
 
-    # free bundlenode, no longer needed
-    lilv.lilv_node_free(bundlenode)
+# ------------------------------------------------------------------------------------------------------------
+# get_pedalboard_info
 
+# Get info from an lv2 bundle
+# @a bundle is a string, consisting of a directory in the filesystem (absolute pathname).
+def get_pedalboard_info(bundle, manager = None):
+    # lilv wants the last character as the separator
+    bundle = get_bundle_path(bundle)
+
+    # Create our own unique lilv world, unless a shared one is provided
+    # We'll load a single bundle and get all plugins from it
+    if manager is None:
+        manager = WorldManager()
+
+    # load the bundle, and unload it when done if it was not already loaded before
+    unload = not manager.is_loaded(bundle)
+    manager.load_bundle(bundle)
+
+    try:
+        return _get_pedalboard_info(manager.world, _get_pedalboard_plugin(manager, bundle), bundle)
+    finally:
+        if unload:
+            manager.unload_bundle(bundle)
+
+# Get the single pedalboard plugin of a loaded bundle
+def _get_pedalboard_plugin(manager, bundle):
     # get all plugins in the bundle
-    plugins = world.get_all_plugins()
+    plugins = manager.get_plugins([bundle])
 
     # make sure the bundle includes 1 and only 1 plugin (the pedalboard)
-    if plugins.size() != 1:
-        raise Exception('get_pedalboard_info(%s) - bundle has 0 or > 1 plugin'.format(bundle))
-
-    # no indexing in python-lilv yet, just get the first item
-    plugin = None
-    for p in plugins:
-        plugin = p
-        break
+    if len(plugins) != 1:
+        raise Exception('get_pedalboard_info(%s) - bundle has 0 or > 1 plugin' % bundle)
 
-    if plugin is None:
-        raise Exception('get_pedalboard_info(%s) - failed to get plugin, you are using an old lilv!'.format(bundle))
+    plugin = plugins[0]
 
     # define the needed stuff
-    ns_rdf      = NS(world, lilv.LILV_NS_RDF)
-    ns_lv2core  = NS(world, lilv.LILV_NS_LV2)
-    ns_ingen    = NS(world, "http://drobilla.net/ns/ingen#")
-    ns_mod      = NS(world, "http://moddevices.com/ns/mod#")
-    ns_modpedal = NS(world, "http://moddevices.com/ns/modpedal#")
+    ns_rdf = get_world_ns(manager.world, lilv.LILV_NS_RDF)
 
     # check if the plugin is a pedalboard
     def fill_in_type(node):
@@ -250,7 +370,17 @@ def get_pedalboard_info(bundle):
     plugin_types = [i for i in LILV_FOREACH(plugin.get_value(ns_rdf.type_), fill_in_type)]
 
     if "http://moddevices.com/ns/modpedal#Pedalboard" not in plugin_types:
-        raise Exception('get_pedalboard_info(%s) - plugin has no mod:Pedalboard type'.format(bundle))
+        raise Exception('get_pedalboard_info(%s) - plugin has no mod:Pedalboard type' % bundle)
+
+    return plugin
+
+def _get_pedalboard_info(world, plugin, bundle):
+    # define the needed stuff
+    ns_rdf      = get_world_ns(world, lilv.LILV_NS_RDF)
+    ns_lv2core  = get_world_ns(world, lilv.LILV_NS_LV2)
+    ns_ingen    = get_world_ns(world, "http://drobilla.net/ns/ingen#")
+    ns_mod      = get_world_ns(world, "http://moddevices.com/ns/mod#")
+    ns_modpedal = get_world_ns(world, "http://moddevices.com/ns/modpedal#")
 
     # let's get all the info now
     ingenarcs   = []
@@ -422,63 +552,101 @@ def get_pedalboard_info(bundle):
 
     return info
 
+# ------------------------------------------------------------------------------------------------------------
+# iter_pedalboards_info
+
+# Get info from all pedalboards inside a directory, one at a time
+# All bundles are loaded in the same lilv world, and unloaded again right after use.
+# Yields (bundle, info, error) for each pedalboard, info is None and error a string if it failed to load.
+# @a rootdir is a string, consisting of a directory in the filesystem.
+# @a manager is an optional WorldManager to use instead of a new one.
+def iter_pedalboards_info(rootdir, manager = None):
+    if manager is None:
+        manager = WorldManager()
+
+    for bundle in get_pedalboard_bundles(rootdir):
+        try:
+            info = get_pedalboard_info(bundle, manager)
+        except Exception as e:
+            yield (bundle, None, str(e))
+        else:
+            yield (bundle, info, None)
+
+# Find all pedalboard bundles inside a directory, sorted by path
+def get_pedalboard_bundles(rootdir):
+    bundles = []
+
+    for root, dirs, files in os.walk(rootdir):
+        dirs.sort()
+
+        for name in dirs:
+            if name.endswith(".pedalboard"):
+                bundles.append(get_bundle_path(os.path.join(root, name)))
+
+        # pedalboards do not contain other pedalboards
+        dirs[:] = [name for name in dirs if not name.endswith(".pedalboard")]
+
+    bundles.sort()
+    return bundles
+
 # ------------------------------------------------------------------------------------------------------------
 # get_pedalboard_name
 
 # Faster version of get_pedalboard_info when we just need to know the pedalboard name
 # @a bundle is a string, consisting of a directory in the filesystem (absolute pathname).
-def get_pedalboard_name(bundle):
+def get_pedalboard_name(bundle, manager = None):
     # lilv wants the last character as the separator
-    bundle = os.path.abspath(bundle)
-    if not bundle.endswith(os.sep):
-        bundle += os.sep
+    bundle = get_bundle_path(bundle)
 
-    # Create our own unique lilv world
+    # Create our own unique lilv world, unless a shared one is provided
     # We'll load a single bundle and get all plugins from it
-    world = lilv.World()
-
-    # this is needed when loading specific bundles instead of load_all
-    # (these functions are not exposed via World yet)
-    lilv.lilv_world_load_specifications(world.me)
-    lilv.lilv_world_load_plugin_classes(world.me)
+    if manager is None:
+        manager = WorldManager()
 
-    # convert bundle string into a lilv node
-    bundlenode = lilv.lilv_new_file_uri(world.me, None, bundle)
+    # load the bundle, and unload it when done if it was not already loaded before
+    unload = not manager.is_loaded(bundle)
+    manager.load_bundle(bundle)
 
-    # load the bundle
-    world.load_bundle(bundlenode)
+    try:
+        return _get_pedalboard_plugin(manager, bundle).get_name().as_string()
+    finally:
+        if unload:
+            manager.unload_bundle(bundle)
 
-    # free bundlenode, no longer needed
-    lilv.lilv_node_free(bundlenode)
-
-    # get all plugins in the bundle
-    plugins = world.get_all_plugins()
+# ------------------------------------------------------------------------------------------------------------
+# get_pedalboards_list
 
-    # make sure the bundle includes 1 and only 1 plugin (the pedalboard)
-    if plugins.size() != 1:
-        raise Exception('get_pedalboard_info(%s) - bundle has 0 or > 1 plugin'.format(bundle))
+# Get the basic info of many pedalboards (name, uri, size, screenshot and thumbnail), for listing
+# Reads the TTL files directly, lilv is only used for bundles that can't be handled that way.
+# @a bundles is a list of strings, consisting of directories in the filesystem (absolute pathnames).
+# @a manager is an optional WorldManager, used for the lilv fallback.
+def get_pedalboards_list(bundles, manager = None):
+    pedalboards = []
 
-    # no indexing in python-lilv yet, just get the first item
-    plugin = None
-    for p in plugins:
-        plugin = p
-        break
+    for bundle in bundles:
+        bundle = get_bundle_path(bundle)
 
-    if plugin is None:
-        raise Exception('get_pedalboard_info(%s) - failed to get plugin, you are using an old lilv!'.format(bundle))
+        try:
+            info = get_pedalboard_summary(bundle)
 
-    # define the needed stuff
-    ns_rdf = NS(world, lilv.LILV_NS_RDF)
+        except TtlError:
+            if manager is None:
+                manager = WorldManager()
 
-    # check if the plugin is a pedalboard
-    def fill_in_type(node):
-        return node.as_string()
-    plugin_types = [i for i in LILV_FOREACH(plugin.get_value(ns_rdf.type_), fill_in_type)]
+            fullinfo = get_pedalboard_info(bundle, manager)
+            info = {
+                'name'      : fullinfo['name'],
+                'uri'       : fullinfo['uri'],
+                'size'      : fullinfo['size'],
+                'screenshot': fullinfo['screenshot'],
+                'thumbnail' : fullinfo['thumbnail'],
+            }
+            del fullinfo
 
-    if "http://moddevices.com/ns/modpedal#Pedalboard" not in plugin_types:
-        raise Exception('get_pedalboard_info(%s) - plugin has no mod:Pedalboard type'.format(bundle))
+        info['bundle'] = bundle
+        pedalboards.append(info)
 
-    return plugin.get_name().as_string()
+    return pedalboards
 
 # ------------------------------------------------------------------------------------------------------------
 # plugin_has_modgui
@@ -486,7 +654,7 @@ def get_pedalboard_name(bundle):
 # Check if a plugin has modgui
 def plugin_has_modgui(world, plugin):
     # define the needed stuff
-    ns_modgui = NS(world, "http://moddevices.com/ns/modgui#")
+    ns_modgui = get_world_ns(world, "http://moddevices.com/ns/modgui#")
 
     # --------------------------------------------------------------------------------------------------------
     # get the proper modgui
@@ -529,28 +697,86 @@ def plugin_has_modgui(world, plugin):
 
 # Get info from a lilv plugin
 # This is used in get_plugins_info below and MOD-SDK
-def get_plugin_info(world, plugin, useAbsolutePath = True):
+# @a instrument is an optional ScanInstrument, to record timings and call counts of each phase
+# @a presets is how presets are handled:
+#  - "full" loads the file of each preset to get its label
+#  - "lazy" uses labels already known (usually from the manifest), only loading preset files without one
+#  - "none" skips presets completely, returning an empty list
+# @a validate can be set to False to only extract data, for hosts that do not care about lint results:
+#  errors and warnings are always empty, modgui files are not checked for existence (so their paths are
+#  returned even if missing) and the deprecated modgui templateData is ignored.
+def get_plugin_info(world, plugin, useAbsolutePath = True, instrument = None, presets = "full", validate = True):
+    presetsMode = presets
+
+    errors   = [] if validate else _Discard()
+    warnings = [] if validate else _Discard()
+
+    if instrument is None:
+        info     = _get_plugin_base_info(world, plugin, useAbsolutePath, errors, warnings)
+        category = _get_plugin_category(world, plugin)
+        gui      = _get_plugin_gui_info(world, plugin, useAbsolutePath, errors, warnings, validate)
+        ports    = _get_plugin_ports_info(world, plugin, errors, warnings)
+        presets  = _get_plugin_presets_info(world, plugin, errors, warnings, presetsMode)
+
+    else:
+        instrument.begin(plugin.get_uri().as_string(), lilv.lilv_uri_to_path(plugin.get_bundle_uri().as_string()))
+
+        try:
+            with instrument.phase('base'):
+                info = _get_plugin_base_info(world, plugin, useAbsolutePath, errors, warnings)
+            with instrument.phase('category'):
+                category = _get_plugin_category(world, plugin)
+            with instrument.phase('gui'):
+                gui = _get_plugin_gui_info(world, plugin, useAbsolutePath, errors, warnings, validate)
+            with instrument.phase('ports'):
+                ports = _get_plugin_ports_info(world, plugin, errors, warnings)
+            with instrument.phase('presets'):
+                presets = _get_plugin_presets_info(world, plugin, errors, warnings, presetsMode)
+        finally:
+            instrument.end()
+
+    # --------------------------------------------------------------------------------------------------------
+    # done
+
+    return {
+        'uri' : info['uri'],
+        'name': info['name'],
+
+        'binary' : info['binary'],
+        'brand'  : info['brand'],
+        'label'  : info['label'],
+        'license': info['license'],
+        'comment': info['comment'],
+
+        'category'    : category,
+        'microVersion': info['microVersion'],
+        'minorVersion': info['minorVersion'],
+
+        'version'  : info['version'],
+        'stability': info['stability'],
+
+        'author' : info['author'],
+        'bundles': info['bundles'],
+        'gui'    : gui,
+        'ports'  : ports,
+        'presets': presets,
+
+        'errors'  : list(errors),
+        'warnings': list(warnings),
+    }
+
+# Get the basic plugin info, everything except category, gui, ports and presets
+def _get_plugin_base_info(world, plugin, useAbsolutePath, errors, warnings):
     # define the needed stuff
-    ns_doap    = NS(world, lilv.LILV_NS_DOAP)
-    ns_foaf    = NS(world, lilv.LILV_NS_FOAF)
-    ns_rdf     = NS(world, lilv.LILV_NS_RDF)
-    ns_rdfs    = NS(world, lilv.LILV_NS_RDFS)
-    ns_lv2core = NS(world, lilv.LILV_NS_LV2)
-    ns_atom    = NS(world, "http://lv2plug.in/ns/ext/atom#")
-    ns_midi    = NS(world, "http://lv2plug.in/ns/ext/midi#")
-    ns_morph   = NS(world, "http://lv2plug.in/ns/ext/morph#")
-    ns_pprops  = NS(world, "http://lv2plug.in/ns/ext/port-props#")
-    ns_pset    = NS(world, "http://lv2plug.in/ns/ext/presets#")
-    ns_units   = NS(world, "http://lv2plug.in/ns/extensions/units#")
-    ns_mod     = NS(world, "http://moddevices.com/ns/mod#")
-    ns_modgui  = NS(world, "http://moddevices.com/ns/modgui#")
+    ns_doap    = get_world_ns(world, lilv.LILV_NS_DOAP)
+    ns_foaf    = get_world_ns(world, lilv.LILV_NS_FOAF)
+    ns_rdfs    = get_world_ns(world, lilv.LILV_NS_RDFS)
+    ns_lv2core = get_world_ns(world, lilv.LILV_NS_LV2)
+    ns_mod     = get_world_ns(world, "http://moddevices.com/ns/mod#")
 
     bundleuri = plugin.get_bundle_uri().as_string()
     bundle    = lilv.lilv_uri_to_path(bundleuri)
 
-    errors   = []
-    warnings = []
-
     # --------------------------------------------------------------------------------------------------------
     # uri
 
@@ -762,6 +988,39 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
 
         del bnodes, it
 
+    return {
+        'uri'         : uri,
+        'name'        : name,
+        'binary'      : binary,
+        'brand'       : brand,
+        'label'       : label,
+        'license'     : license,
+        'comment'     : comment,
+        'microVersion': microVersion,
+        'minorVersion': minorVersion,
+        'version'     : version,
+        'stability'   : stability,
+        'author'      : author,
+        'bundles'     : bundles,
+    }
+
+# Get the categories of a plugin
+def _get_plugin_category(world, plugin):
+    # define the needed stuff
+    ns_rdf = get_world_ns(world, lilv.LILV_NS_RDF)
+
+    return get_category(plugin.get_value(ns_rdf.type_))
+
+# Get the modgui info of a plugin
+# Without @a validate, modgui files are not checked for existence and templateData is ignored
+def _get_plugin_gui_info(world, plugin, useAbsolutePath, errors, warnings, validate = True):
+    # define the needed stuff
+    ns_lv2core = get_world_ns(world, lilv.LILV_NS_LV2)
+    ns_modgui  = get_world_ns(world, "http://moddevices.com/ns/modgui#")
+
+    bundleuri = plugin.get_bundle_uri().as_string()
+    bundle    = lilv.lilv_uri_to_path(bundleuri)
+
     # --------------------------------------------------------------------------------------------------------
     # get the proper modgui
 
@@ -823,7 +1082,7 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
                 errors.append("modgui has no iconTemplate data")
             else:
                 iconFile = lilv.lilv_uri_to_path(modgui_icon.as_string())
-                if os.path.exists(iconFile):
+                if not validate or os.path.exists(iconFile):
                     gui['iconTemplate'] = iconFile if useAbsolutePath else iconFile.replace(bundle,"",1)
                 else:
                     errors.append("modgui iconTemplate file is missing")
@@ -831,7 +1090,7 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
 
             if modgui_setts.me is not None:
                 settingsFile = lilv.lilv_uri_to_path(modgui_setts.as_string())
-                if os.path.exists(settingsFile):
+                if not validate or os.path.exists(settingsFile):
                     gui['settingsTemplate'] = settingsFile if useAbsolutePath else settingsFile.replace(bundle,"",1)
                 else:
                     errors.append("modgui settingsTemplate file is missing")
@@ -843,7 +1102,7 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
 
             if modgui_script.me is not None:
                 javascriptFile = lilv.lilv_uri_to_path(modgui_script.as_string())
-                if os.path.exists(javascriptFile):
+                if not validate or os.path.exists(javascriptFile):
                     gui['javascript'] = javascriptFile if useAbsolutePath else javascriptFile.replace(bundle,"",1)
                 else:
                     errors.append("modgui javascript file is missing")
@@ -853,7 +1112,7 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
                 errors.append("modgui has no stylesheet data")
             else:
                 stylesheetFile = lilv.lilv_uri_to_path(modgui_style.as_string())
-                if os.path.exists(stylesheetFile):
+                if not validate or os.path.exists(stylesheetFile):
                     gui['stylesheet'] = stylesheetFile if useAbsolutePath else stylesheetFile.replace(bundle,"",1)
                 else:
                     errors.append("modgui stylesheet file is missing")
@@ -861,9 +1120,12 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
 
             # template data for backwards compatibility
             # FIXME remove later once we got rid of all templateData files
-            modgui_templ = world.find_nodes(modguigui.me, ns_modgui.templateData.me, None).get_first()
+            if validate:
+                modgui_templ = world.find_nodes(modguigui.me, ns_modgui.templateData.me, None).get_first()
+            else:
+                modgui_templ = None
 
-            if modgui_templ.me is not None:
+            if modgui_templ is not None and modgui_templ.me is not None:
                 warnings.append("modgui is using old deprecated templateData")
                 templFile = lilv.lilv_uri_to_path(modgui_templ.as_string())
                 if os.path.exists(templFile):
@@ -901,7 +1163,7 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
 
             if modgui_scrn.me is not None:
                 gui['screenshot'] = lilv.lilv_uri_to_path(modgui_scrn.as_string())
-                if not os.path.exists(gui['screenshot']):
+                if validate and not os.path.exists(gui['screenshot']):
                     errors.append("modgui screenshot file is missing")
                 if not useAbsolutePath:
                     gui['screenshot'] = gui['screenshot'].replace(bundle,"",1)
@@ -910,7 +1172,7 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
 
             if modgui_thumb.me is not None:
                 gui['thumbnail'] = lilv.lilv_uri_to_path(modgui_thumb.as_string())
-                if not os.path.exists(gui['thumbnail']):
+                if validate and not os.path.exists(gui['thumbnail']):
                     errors.append("modgui thumbnail file is missing")
                 if not useAbsolutePath:
                     gui['thumbnail'] = gui['thumbnail'].replace(bundle,"",1)
@@ -988,6 +1250,51 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
             # cleanup
             del ports, nodes, it
 
+    return gui
+
+# Reads the values of a port through lilv, using the predicate nodes shared by the world (see _WorldNodes)
+class _PortReader(object):
+    def __init__(self, port, nodes):
+        self.port  = port
+        self.nodes = nodes
+
+    def _node(self, uri):
+        return self.nodes.get_node(uri)
+
+    def get_name(self):
+        return lilv.lilv_node_as_string(self.port.get_name()) or ""
+
+    def get_first(self, uri):
+        return lilv.lilv_nodes_get_first(self.port.get_value(self._node(uri).me))
+
+    def get_strings(self, uri):
+        return get_port_data(self.port, self._node(uri))
+
+    def has_value(self, uri):
+        return self.port.get_value(self._node(uri).me) is not None
+
+    def supports_event(self, uri):
+        return self.port.supports_event(self._node(uri).me)
+
+    as_string = staticmethod(lilv.lilv_node_as_string)
+    as_uri    = staticmethod(lilv.lilv_node_as_uri)
+    as_float  = staticmethod(lilv.lilv_node_as_float)
+    as_int    = staticmethod(lilv.lilv_node_as_int)
+
+# Get the ports info of a plugin
+def _get_plugin_ports_info(world, plugin, errors, warnings):
+    # define the needed stuff
+    ns_rdf     = lilv.LILV_NS_RDF
+    ns_lv2core = lilv.LILV_NS_LV2
+    ns_atom    = "http://lv2plug.in/ns/ext/atom#"
+    ns_midi    = "http://lv2plug.in/ns/ext/midi#"
+    ns_pprops  = "http://lv2plug.in/ns/ext/port-props#"
+    ns_units   = "http://lv2plug.in/ns/extensions/units#"
+    ns_mod     = "http://moddevices.com/ns/mod#"
+
+    # lilv nodes of the predicates, shared by all ports
+    nodes = _get_world_nodes(world)
+
     # --------------------------------------------------------------------------------------------------------
     # ports
 
@@ -1003,8 +1310,10 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
 
     # function for filling port info
     def fill_port_info(port):
+        reader = _PortReader(port, nodes)
+
         # base data
-        portname = lilv.lilv_node_as_string(port.get_name()) or ""
+        portname = reader.get_name()
 
         if not portname:
             portname = "_%i" % index
@@ -1029,10 +1338,10 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
             portsymbols.append(portsymbol)
 
         # short name
-        psname = lilv.lilv_nodes_get_first(port.get_value(ns_lv2core.shortName.me))
+        psname = reader.get_first(ns_lv2core + "shortName")
 
         if psname is not None:
-            psname = lilv.lilv_node_as_string(psname) or ""
+            psname = reader.as_string(psname) or ""
 
         if not psname:
             psname = get_short_port_name(portname)
@@ -1044,15 +1353,15 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
             errors.append("port '%s' short name has more than 16 characters" % portname)
 
         # check for old style shortName
-        if port.get_value(ns_lv2core.shortname.me) is not None:
+        if reader.has_value(ns_lv2core + "shortname"):
             errors.append("port '%s' short name is using old style 'shortname' instead of 'shortName'" % portname)
 
         # port types
-        types = [typ.rsplit("#",1)[-1].replace("Port","",1) for typ in get_port_data(port, ns_rdf.type_)]
+        types = [typ.rsplit("#",1)[-1].replace("Port","",1) for typ in reader.get_strings(ns_rdf + "type")]
 
         if "Atom" in types \
-            and port.supports_event(ns_midi.MidiEvent.me) \
-            and lilv.Nodes(port.get_value(ns_atom.bufferType.me)).get_first() == ns_atom.Sequence:
+            and reader.supports_event(ns_midi + "MidiEvent") \
+            and reader.as_uri(reader.get_first(ns_atom + "bufferType")) == ns_atom + "Sequence":
                 types.append("MIDI")
 
         #if "Morph" in types:
@@ -1063,16 +1372,16 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
                     #types.append(morphtyp.rsplit("#",1)[-1].replace("Port","",1))
 
         # port comment
-        pcomment = (get_port_data(port, ns_rdfs.comment) or [""])[0]
+        pcomment = (reader.get_strings(lilv.LILV_NS_RDFS + "comment") or [""])[0]
 
         # port designation
-        designation = (get_port_data(port, ns_lv2core.designation) or [""])[0]
+        designation = (reader.get_strings(ns_lv2core + "designation") or [""])[0]
 
         # port rangeSteps
-        rangeSteps = (get_port_data(port, ns_mod.rangeSteps) or get_port_data(port, ns_pprops.rangeSteps) or [None])[0]
+        rangeSteps = (reader.get_strings(ns_mod + "rangeSteps") or reader.get_strings(ns_pprops + "rangeSteps") or [None])[0]
 
         # port properties
-        properties = [typ.rsplit("#",1)[-1] for typ in get_port_data(port, ns_lv2core.portProperty)]
+        properties = [typ.rsplit("#",1)[-1] for typ in reader.get_strings(ns_lv2core + "portProperty")]
 
         # data
         ranges      = {}
@@ -1090,29 +1399,32 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
             if isInteger and "CV" in types:
                 errors.append("port '%s' has integer property and CV type" % portname)
 
-            xdefault = lilv.lilv_nodes_get_first(port.get_value(ns_mod.default.me)) or \
-                       lilv.lilv_nodes_get_first(port.get_value(ns_lv2core.default.me))
-            xminimum = lilv.lilv_nodes_get_first(port.get_value(ns_mod.minimum.me)) or \
-                       lilv.lilv_nodes_get_first(port.get_value(ns_lv2core.minimum.me))
-            xmaximum = lilv.lilv_nodes_get_first(port.get_value(ns_mod.maximum.me)) or \
-                       lilv.lilv_nodes_get_first(port.get_value(ns_lv2core.maximum.me))
+            xdefault = reader.get_first(ns_mod + "default")
+            if xdefault is None:
+                xdefault = reader.get_first(ns_lv2core + "default")
+            xminimum = reader.get_first(ns_mod + "minimum")
+            if xminimum is None:
+                xminimum = reader.get_first(ns_lv2core + "minimum")
+            xmaximum = reader.get_first(ns_mod + "maximum")
+            if xmaximum is None:
+                xmaximum = reader.get_first(ns_lv2core + "maximum")
 
             if xminimum is not None and xmaximum is not None:
                 if isInteger:
-                    if is_integer(lilv.lilv_node_as_string(xminimum)):
-                        ranges['minimum'] = lilv.lilv_node_as_int(xminimum)
+                    if is_integer(reader.as_string(xminimum)):
+                        ranges['minimum'] = reader.as_int(xminimum)
                     else:
-                        ranges['minimum'] = lilv.lilv_node_as_float(xminimum)
+                        ranges['minimum'] = reader.as_float(xminimum)
                         if fmod(ranges['minimum'], 1.0) == 0.0:
                             warnings.append("port '%s' has integer property but minimum value is float" % portname)
                         else:
                             errors.append("port '%s' has integer property but minimum value has non-zero decimals" % portname)
                         ranges['minimum'] = int(ranges['minimum'])
 
-                    if is_integer(lilv.lilv_node_as_string(xmaximum)):
-                        ranges['maximum'] = lilv.lilv_node_as_int(xmaximum)
+                    if is_integer(reader.as_string(xmaximum)):
+                        ranges['maximum'] = reader.as_int(xmaximum)
                     else:
-                        ranges['maximum'] = lilv.lilv_node_as_float(xmaximum)
+                        ranges['maximum'] = reader.as_float(xmaximum)
                         if fmod(ranges['maximum'], 1.0) == 0.0:
                             warnings.append("port '%s' has integer property but maximum value is float" % portname)
                         else:
@@ -1120,13 +1432,13 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
                         ranges['maximum'] = int(ranges['maximum'])
 
                 else:
-                    ranges['minimum'] = lilv.lilv_node_as_float(xminimum)
-                    ranges['maximum'] = lilv.lilv_node_as_float(xmaximum)
+                    ranges['minimum'] = reader.as_float(xminimum)
+                    ranges['maximum'] = reader.as_float(xmaximum)
 
-                    if is_integer(lilv.lilv_node_as_string(xminimum)):
+                    if is_integer(reader.as_string(xminimum)):
                         warnings.append("port '%s' minimum value is an integer" % portname)
 
-                    if is_integer(lilv.lilv_node_as_string(xmaximum)):
+                    if is_integer(reader.as_string(xmaximum)):
                         warnings.append("port '%s' maximum value is an integer" % portname)
 
                 if ranges['minimum'] >= ranges['maximum']:
@@ -1135,19 +1447,19 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
 
                 if xdefault is not None:
                     if isInteger:
-                        if is_integer(lilv.lilv_node_as_string(xdefault)):
-                            ranges['default'] = lilv.lilv_node_as_int(xdefault)
+                        if is_integer(reader.as_string(xdefault)):
+                            ranges['default'] = reader.as_int(xdefault)
                         else:
-                            ranges['default'] = lilv.lilv_node_as_float(xdefault)
+                            ranges['default'] = reader.as_float(xdefault)
                             if fmod(ranges['default'], 1.0) == 0.0:
                                 warnings.append("port '%s' has integer property but default value is float" % portname)
                             else:
                                 errors.append("port '%s' has integer property but default value has non-zero decimals" % portname)
                             ranges['default'] = int(ranges['default'])
                     else:
-                        ranges['default'] = lilv.lilv_node_as_float(xdefault)
+                        ranges['default'] = reader.as_float(xdefault)
 
-                        if is_integer(lilv.lilv_node_as_string(xdefault)):
+                        if is_integer(reader.as_string(xdefault)):
                             warnings.append("port '%s' default value is an integer" % portname)
 
                     testmin = ranges['minimum']
@@ -1180,15 +1492,15 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
                 if "CV" not in types and designation != "http://lv2plug.in/ns/lv2core#latency":
                     errors.append("port '%s' is missing value ranges" % portname)
 
-            nodes = port.get_scale_points()
+            spoints = port.get_scale_points()
 
-            if nodes is not None:
+            if spoints is not None:
                 scalepoints_unsorted = []
 
-                it = lilv.lilv_scale_points_begin(nodes)
-                while not lilv.lilv_scale_points_is_end(nodes, it):
-                    sp = lilv.lilv_scale_points_get(nodes, it)
-                    it = lilv.lilv_scale_points_next(nodes, it)
+                it = lilv.lilv_scale_points_begin(spoints)
+                while not lilv.lilv_scale_points_is_end(spoints, it):
+                    sp = lilv.lilv_scale_points_get(spoints, it)
+                    it = lilv.lilv_scale_points_next(spoints, it)
 
                     if sp is None:
                         continue
@@ -1247,48 +1559,13 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
         # control ports might contain unit
         if "Control" in types:
             # unit
-            uunit = lilv.lilv_nodes_get_first(port.get_value(ns_units.unit.me))
+            uunit = reader.get_first(ns_units + "unit")
 
             if uunit is not None:
-                uuri = lilv.lilv_node_as_uri(uunit)
-
-                # using pre-existing lv2 unit
-                if uuri is not None and uuri.startswith("http://lv2plug.in/ns/"):
-                    uuri  = uuri.replace("http://lv2plug.in/ns/extensions/units#","",1)
-                    alnum = uuri.isalnum()
-
-                    if not alnum:
-                        errors.append("port '%s' has wrong lv2 unit uri" % portname)
-                        uuri = uuri.rsplit("#",1)[-1].rsplit("/",1)[-1]
-
-                    ulabel, urender, usymbol = get_port_unit(uuri)
-
-                    if alnum and not (ulabel and urender and usymbol):
-                        errors.append("port '%s' has unknown lv2 unit (our bug?, data is '%s', '%s', '%s')" % (portname,
-                                                                                                               ulabel,
-                                                                                                               urender,
-                                                                                                               usymbol))
+                ulabel, urender, usymbol, diagnostics = nodes.get_unit(reader.as_uri(uunit), uunit)
 
-                # using custom unit
-                else:
-                    xlabel  = world.find_nodes(uunit, ns_rdfs  .label.me, None).get_first()
-                    xrender = world.find_nodes(uunit, ns_units.render.me, None).get_first()
-                    xsymbol = world.find_nodes(uunit, ns_units.symbol.me, None).get_first()
-
-                    if xlabel.me is not None:
-                        ulabel = xlabel.as_string()
-                    else:
-                        errors.append("port '%s' has custom unit with no label" % portname)
-
-                    if xrender.me is not None:
-                        urender = xrender.as_string()
-                    else:
-                        errors.append("port '%s' has custom unit with no render" % portname)
-
-                    if xsymbol.me is not None:
-                        usymbol = xsymbol.as_string()
-                    else:
-                        errors.append("port '%s' has custom unit with no symbol" % portname)
+                for isError, message, args in diagnostics:
+                    (errors if isError else warnings).append(message % ((portname,) + args))
 
         return (types, {
             'name'   : portname,
@@ -1321,14 +1598,36 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
                 ports[typ] = { 'input': [], 'output': [] }
             ports[typ]["input" if isInput else "output"].append(info)
 
+    return ports
+
+# Get the presets of a plugin
+# @a mode is one of PRESETS_MODES, see get_plugin_info
+def _get_plugin_presets_info(world, plugin, errors, warnings, mode = "full"):
+    if mode == "none":
+        return []
+
+    # define the needed stuff
+    ns_rdfs = get_world_ns(world, lilv.LILV_NS_RDFS)
+    ns_pset = get_world_ns(world, "http://lv2plug.in/ns/ext/presets#")
+
     # --------------------------------------------------------------------------------------------------------
     # presets
 
     def get_preset_data(preset):
-        world.load_resource(preset.me)
+        if mode == "lazy":
+            # labels declared in the manifest (or already loaded) don't need the preset file
+            labelnode = world.find_nodes(preset.me, ns_rdfs.label.me, None).get_first()
+
+            if labelnode.me is None:
+                world.load_resource(preset.me)
+                labelnode = world.find_nodes(preset.me, ns_rdfs.label.me, None).get_first()
+
+        else:
+            world.load_resource(preset.me)
+            labelnode = world.find_nodes(preset.me, ns_rdfs.label.me, None).get_first()
 
         uri   = preset.as_string() or ""
-        label = world.find_nodes(preset.me, ns_rdfs.label.me, None).get_first().as_string() or ""
+        label = labelnode.as_string() or ""
 
         if not uri:
             errors.append("preset with label '%s' has no uri" % (label or "<unknown>"))
@@ -1351,120 +1650,627 @@ def get_plugin_info(world, plugin, useAbsolutePath = True):
 
     del presets_related
 
-    # --------------------------------------------------------------------------------------------------------
-    # done
+    return presets
 
-    return {
-        'uri' : uri,
-        'name': name,
+# ------------------------------------------------------------------------------------------------------------
+# preload_presets
+
+# Load the files of all presets of several plugins in one go
+# Each file is only loaded once, even when many presets share it.
+# Afterwards presets can be read using the "lazy" mode without loading anything.
+# @a onlyMissing skips presets that already have a label (declared in the manifest).
+# @a loaded is a set of the preset files already loaded, updated in place; pass the same one when preloading
+# plugins in several batches, so files shared between batches are not loaded again.
+def preload_presets(world, plugins, onlyMissing = True, loaded = None):
+    # define the needed stuff
+    ns_rdfs = get_world_ns(world, lilv.LILV_NS_RDFS)
+    ns_pset = get_world_ns(world, "http://lv2plug.in/ns/ext/presets#")
 
-        'binary' : binary,
-        'brand'  : brand,
-        'label'  : label,
-        'license': license,
-        'comment': comment,
+    if loaded is None:
+        loaded = set()
 
-        'category'    : get_category(plugin.get_value(ns_rdf.type_)),
-        'microVersion': microVersion,
-        'minorVersion': minorVersion,
+    for plugin in plugins:
+        presets = plugin.get_related(ns_pset.Preset)
 
-        'version'  : version,
-        'stability': stability,
+        it = presets.begin()
+        while not presets.is_end(it):
+            preset = presets.get(it)
+            it     = presets.next(it)
 
-        'author' : author,
-        'bundles': bundles,
-        'gui'    : gui,
-        'ports'  : ports,
-        'presets': presets,
+            if preset.me is None:
+                continue
 
-        'errors'  : errors,
-        'warnings': warnings,
-    }
+            if onlyMissing and world.find_nodes(preset.me, ns_rdfs.label.me, None).get_first().me is not None:
+                continue
+
+            def fill_in_file(node):
+                return node.as_string()
+            files = set(LILV_FOREACH(world.find_nodes(preset.me, ns_rdfs.seeAlso.me, None), fill_in_file))
+
+            if len(files) != 0 and files.issubset(loaded):
+                continue
+
+            world.load_resource(preset.me)
+            loaded.update(files)
+
+        del presets
+
+# ------------------------------------------------------------------------------------------------------------
+# get_plugins_presets
+
+# Get the presets of many plugins at once, as a dict of plugin uri -> presets
+# All the needed preset files are loaded in a single pass first, see preload_presets.
+def get_plugins_presets(world, plugins):
+    plugins = list(plugins)
+    presets = {}
+
+    preload_presets(world, plugins)
+
+    for plugin in plugins:
+        presets[plugin.get_uri().as_string()] = _get_plugin_presets_info(world, plugin, [], [], "lazy")
+
+    return presets
+
+# ------------------------------------------------------------------------------------------------------------
+# PluginInfo
+
+# Lazy version of the get_plugin_info data
+# The basic info is extracted right away, gui, ports and presets only when first accessed.
+# The lilv world must stay valid (and the plugin bundle loaded) while the object is in use.
+class PluginInfo(object):
+    __slots__ = (
+        'world', 'plugin', 'useAbsolutePath', 'presetsMode', 'validate',
+        'uri', 'name', 'binary', 'brand', 'label', 'license', 'comment', 'category',
+        'microVersion', 'minorVersion', 'version', 'stability', 'author', 'bundles',
+        '_gui', '_ports', '_presets', '_errors', '_warnings',
+    )
+
+    KEYS = (
+        'uri', 'name', 'binary', 'brand', 'label', 'license', 'comment', 'category',
+        'microVersion', 'minorVersion', 'version', 'stability', 'author', 'bundles',
+        'gui', 'ports', 'presets', 'errors', 'warnings',
+    )
+
+    def __init__(self, world, plugin, useAbsolutePath = True, presets = "full", validate = True):
+        self.world  = world
+        self.plugin = plugin
+        self.useAbsolutePath = useAbsolutePath
+        self.presetsMode     = presets
+        self.validate        = validate
+
+        # errors and warnings per section, joined in the same order as get_plugin_info
+        self._errors   = { 'base': self._new_list(), 'gui': None, 'ports': None, 'presets': None }
+        self._warnings = { 'base': self._new_list(), 'gui': None, 'ports': None, 'presets': None }
+
+        info = _get_plugin_base_info(world, plugin, useAbsolutePath, self._errors['base'], self._warnings['base'])
+
+        for key, value in info.items():
+            setattr(self, key, value)
+
+        self.category = _get_plugin_category(world, plugin)
+
+        self._gui     = None
+        self._ports   = None
+        self._presets = None
+
+    def _new_list(self):
+        return [] if self.validate else _Discard()
+
+    def _section(self, name):
+        errors   = self._errors[name]   = self._new_list()
+        warnings = self._warnings[name] = self._new_list()
+        return (errors, warnings)
+
+    @property
+    def gui(self):
+        if self._gui is None:
+            errors, warnings = self._section('gui')
+            self._gui = _get_plugin_gui_info(self.world, self.plugin, self.useAbsolutePath, errors, warnings,
+                                             self.validate)
+        return self._gui
+
+    @property
+    def ports(self):
+        if self._ports is None:
+            errors, warnings = self._section('ports')
+            self._ports = _get_plugin_ports_info(self.world, self.plugin, errors, warnings)
+        return self._ports
+
+    @property
+    def presets(self):
+        if self._presets is None:
+            errors, warnings = self._section('presets')
+            self._presets = _get_plugin_presets_info(self.world, self.plugin, errors, warnings, self.presetsMode)
+        return self._presets
+
+    # compute all pending sections
+    def load(self):
+        self.gui
+        self.ports
+        self.presets
+
+    # errors and warnings need all sections
+    @property
+    def errors(self):
+        self.load()
+        return list(self._errors['base']) + self._errors['gui'] + self._errors['ports'] + self._errors['presets']
+
+    @property
+    def warnings(self):
+        self.load()
+        return list(self._warnings['base']) + self._warnings['gui'] + self._warnings['ports'] + \
+               self._warnings['presets']
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self):
+        return list(self.KEYS)
+
+    # Convert into the exact same dict get_plugin_info returns
+    def to_dict(self):
+        return dict((key, getattr(self, key)) for key in self.KEYS)
+
+# Get lazy info from a lilv plugin
+def get_plugin_info_lazy(world, plugin, useAbsolutePath = True, presets = "full", validate = True):
+    return PluginInfo(world, plugin, useAbsolutePath, presets, validate)
 
 # ------------------------------------------------------------------------------------------------------------
 # get_plugin_info_helper
 
 # Get info from a simple URI, without the need of your own lilv world
 # This is used by get_plugins_info in MOD-SDK
-def get_plugin_info_helper(uri):
+# Only the bundles that define the plugin are loaded, a full scan is done only when the index does not know about it.
+# An empty @a uri returns the info of all installed plugins instead.
+def get_plugin_info_helper(uri, manager = None, index = None):
+    if not uri:
+        world = lilv.World()
+        world.load_all()
+        plugins = world.get_all_plugins()
+        return [get_plugin_info(world, p, False) for p in plugins]
+
+    if index is None:
+        index = _get_plugin_index()
+
+    bundles = index.lookup(uri)
+
+    # maybe the plugin was installed after the index was created
+    if len(bundles) == 0:
+        index.refresh()
+        bundles = index.lookup(uri)
+
+    if len(bundles) != 0:
+        if manager is None:
+            manager = WorldManager()
+
+        for bundle in bundles:
+            manager.load_bundle(bundle)
+
+        plugin = _get_plugin_by_uri(manager.get_plugins(bundles), uri)
+
+        if plugin is not None:
+            return get_plugin_info(manager.world, plugin, False)
+
+    # not found, try the slow way
     world = lilv.World()
     world.load_all()
-    plugins = world.get_all_plugins()
-    return [get_plugin_info(world, p, False) for p in plugins]
+    plugin = _get_plugin_by_uri(world.get_all_plugins(), uri)
+
+    if plugin is None:
+        raise Exception('get_plugin_info_helper(%s) - plugin not found' % uri)
+
+    return get_plugin_info(world, plugin, False)
+
+def _get_plugin_by_uri(plugins, uri):
+    for p in plugins:
+        if p.get_uri().as_string() == uri:
+            return p
+    return None
+
+# index shared between get_plugin_info_helper calls
+_plugin_index = None
+
+def _get_plugin_index():
+    global _plugin_index
+
+    if _plugin_index is None:
+        _plugin_index = PluginIndex()
+
+    return _plugin_index
 
 # ------------------------------------------------------------------------------------------------------------
 # get_plugins_info
 
 # Get plugin-related info from a list of lv2 bundles
 # @a bundles is a list of strings, consisting of directories in the filesystem (absolute pathnames).
-def get_plugins_info(bundles):
+# @a cache is an optional PluginInfoCache, bundles which did not change since the last scan are taken from it.
+# @a manager is an optional WorldManager, bundles are kept loaded in it for later requests.
+# @a jobs is the number of worker processes to scan with, each one using its own lilv world.
+# @a executor is an optional concurrent.futures executor to run those workers on.
+# @a instrument is an optional ScanInstrument, to record timings and call counts of each scanned plugin.
+# @a presets is how presets are handled, see get_plugin_info. In "full" mode all preset files are loaded in one pass.
+# @a validate can be set to False to skip errors, warnings and file checks, see get_plugin_info.
+def get_plugins_info(bundles, cache = None, manager = None, jobs = None, executor = None, instrument = None,
+                     presets = "full", validate = True):
+    infos = list(iter_plugins_info(bundles, cache, manager, jobs, executor, instrument, presets, validate))
+
+    # make sure the bundles include something
+    if len(infos) == 0:
+        raise Exception('get_plugins_info() - selected bundles have no plugins')
+
+    # keep the same order as lilv, which sorts plugins by uri
+    infos.sort(key=lambda info: info['uri'])
+    return infos
+
+# ------------------------------------------------------------------------------------------------------------
+# iter_plugins_info
+
+# Same as get_plugins_info, but yields the info of each plugin as soon as it is ready
+# Plugins are not sorted when using the cache or several jobs, and bundles without plugins are not an error.
+# With @a withBundle (bundle, info) pairs are yielded instead, bundle being the path of the bundle lilv reports for
+# the plugin (info['bundles'] is empty, as paths are not absolute), ready for PluginCatalog.
+def iter_plugins_info(bundles, cache = None, manager = None, jobs = None, executor = None, instrument = None,
+                      presets = "full", validate = True, withBundle = False):
     # if empty, do nothing
     if len(bundles) == 0:
         raise Exception('get_plugins_info() - no bundles provided')
 
-    # Create our own unique lilv world
-    # We'll load the selected bundles and get all plugins from it
-    world = lilv.World()
+    # lilv wants the last character as the separator
+    bundles = [get_bundle_path(bundle) for bundle in bundles]
+
+    if presets not in PRESETS_MODES:
+        raise Exception('get_plugins_info() - invalid presets mode \'%s\'' % presets)
+
+    results = _iter_plugins_info(bundles, cache, manager, jobs, executor, instrument, presets, validate)
 
-    # this is needed when loading specific bundles instead of load_all
-    # (these functions are not exposed via World yet)
-    lilv.lilv_world_load_specifications(world.me)
-    lilv.lilv_world_load_plugin_classes(world.me)
+    if withBundle:
+        return results
+
+    return (info for bundle, info in results)
+
+# Same as iter_plugins_info, always yielding (bundle, info) pairs
+def _iter_plugins_info(bundles, cache, manager, jobs, executor, instrument, presets, validate):
+    parallel = executor is not None or (jobs is not None and jobs > 1)
+    variant  = _get_cache_variant(presets, validate)
+
+    if cache is None:
+        if parallel:
+            results = _iter_bundles_parallel(bundles, jobs, executor, instrument, presets, validate)
+        else:
+            results = _iter_bundles(bundles, manager, instrument, presets, validate)
+
+        for result in results:
+            yield result
+
+        return
+
+    # bundles that share plugins (like presets or modgui bundles of a plugin) are checked and scanned together,
+    # since a plugin only gets its full data when all of its bundles are loaded. Unchanged groups are ready right away.
+    fingerprints = {}
+    for group in _group_bundles(bundles):
+        fingerprint = get_group_fingerprint([(bundle, cache.fingerprint(bundle)) for bundle in group])
+        plugins     = []
+
+        for bundle in group:
+            bplugins = cache.get(bundle, fingerprint, variant)
+
+            if bplugins is None:
+                plugins = None
+                break
+
+            plugins.extend((bundle, info) for info in bplugins)
+
+        if plugins is None:
+            for bundle in group:
+                fingerprints[bundle] = fingerprint
+            continue
+
+        for result in plugins:
+            yield result
+
+    if len(fingerprints) == 0:
+        return
+
+    # only load the modified groups of bundles
+    dirty   = [bundle for bundle in bundles if bundle in fingerprints]
+    scanned = dict((bundle, []) for bundle in dirty)
+
+    if parallel:
+        results = _iter_bundles_parallel(dirty, jobs, executor, instrument, presets, validate)
+
+    else:
+        # modified bundles might be in the shared world already, with old data
+        if manager is not None:
+            for bundle in dirty:
+                if manager.is_loaded(bundle):
+                    manager.reload_bundle(bundle)
+
+        results = _iter_bundles(dirty, manager, instrument, presets, validate)
+
+    # plugins are stored with the bundle lilv reports for them, other bundles of the group get an empty list
+    for bundle, info in results:
+        if bundle in scanned:
+            scanned[bundle].append(info)
+        yield (bundle, info)
+
+    for bundle, plugins in scanned.items():
+        cache.put(bundle, fingerprints[bundle], plugins, variant)
+
+    cache.save()
+
+# Get the cache variant for some scan options, so that results of other options are not reused
+def _get_cache_variant(presets, validate):
+    options = []
+    if presets != "full":
+        options.append("presets=%s" % presets)
+    if not validate:
+        options.append("validate=0")
+    return ",".join(options)
+
+# Scan a list of normalized bundle paths, yields (bundle, info) for each plugin found
+def _iter_bundles(bundles, manager = None, instrument = None, presets = "full", validate = True):
+    # Create our own unique lilv world, unless a shared one is provided
+    # We'll load the selected bundles and get all plugins from it
+    if manager is None:
+        manager = WorldManager()
 
     # load all bundles
     for bundle in bundles:
-        # lilv wants the last character as the separator
-        bundle = os.path.abspath(bundle)
-        if not bundle.endswith(os.sep):
-            bundle += os.sep
+        manager.load_bundle(bundle)
 
-        # convert bundle string into a lilv node
-        bundlenode = lilv.lilv_new_file_uri(world.me, None, bundle)
+    # get all plugins available in the selected bundles
+    plugins = manager.get_plugins(bundles)
+
+    # load preset files a few plugins at a time instead of one by one for each preset, without delaying
+    # the first results until every preset file is loaded
+    if presets != "full":
+        for p in plugins:
+            yield (manager.get_plugin_bundle(p), get_plugin_info(manager.world, p, False, instrument, presets, validate))
+        return
+
+    loaded = set()
+
+    for i in range(0, len(plugins), PRESETS_BATCH_SIZE):
+        batch = plugins[i:i+PRESETS_BATCH_SIZE]
+        preload_presets(manager.world, batch, False, loaded)
+
+        for p in batch:
+            yield (manager.get_plugin_bundle(p), get_plugin_info(manager.world, p, False, instrument, "lazy", validate))
+
+# Same as _iter_bundles, to be run inside a worker process
+# Returns the results and the instrument records, if requested.
+def _scan_bundles(bundles, instrumented = False, presets = "full", validate = True):
+    instrument = ScanInstrument() if instrumented else None
+    results    = list(_iter_bundles(bundles, None, instrument, presets, validate))
+    return (results, instrument.records if instrumented else None)
+
+# Same as _iter_bundles, but split across several processes
+# Results are yielded as each group of bundles is done.
+def _iter_bundles_parallel(bundles, jobs, executor, instrument, presets, validate):
+    groups = _split_bundles(bundles, jobs or os.cpu_count() or 1)
+
+    # not worth the trouble
+    if len(groups) <= 1:
+        for result in _iter_bundles(bundles, None, instrument, presets, validate):
+            yield result
+        return
+
+    if executor is None:
+        ownexecutor = executor = ProcessPoolExecutor(max_workers=len(groups))
+    else:
+        ownexecutor = None
 
-        # load the bundle
-        world.load_bundle(bundlenode)
+    try:
+        futures = [executor.submit(_scan_bundles, group, instrument is not None, presets, validate) for group in groups]
 
-        # free bundlenode, no longer needed
-        lilv.lilv_node_free(bundlenode)
+        for future in as_completed(futures):
+            results, records = future.result()
 
-    # get all plugins available in the selected bundles
-    plugins = world.get_all_plugins()
+            if instrument is not None:
+                instrument.merge(records)
 
-    # make sure the bundles include something
-    if plugins.size() == 0:
-        raise Exception('get_plugins_info() - selected bundles have no plugins')
+            for result in results:
+                yield result
+
+    finally:
+        if ownexecutor is not None:
+            ownexecutor.shutdown(wait=False)
+
+# Group bundles that declare the same plugin (like a modgui or presets bundle, linked with lv2:appliesTo)
+# Returns a list of groups, each a list of bundles in the original order.
+def _group_bundles(bundles):
+    # union-find of bundle indexes, joined by the plugins in their manifest
+    parents = list(range(len(bundles)))
+    owners  = {}
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    for i, bundle in enumerate(bundles):
+        for uri in get_manifest_plugins(bundle):
+            if uri in owners:
+                parents[find(i)] = find(owners[uri])
+            else:
+                owners[uri] = i
+
+    units = {}
+    for i, bundle in enumerate(bundles):
+        try:
+            units[find(i)].append(bundle)
+        except KeyError:
+            units[find(i)] = [bundle]
+
+    return list(units.values())
+
+# Split bundles into groups of similar size, for scanning in separate lilv worlds
+# Bundles that declare the same plugin (like a modgui or presets bundle) are kept in the same group,
+# so that each world sees the full plugin data.
+def _split_bundles(bundles, count):
+    units = _group_bundles(bundles)
+
+    # biggest units first, always into the smallest group
+    groups = [[] for i in range(min(count, len(units)))]
+
+    for unit in sorted(units, key=len, reverse=True):
+        min(groups, key=len).extend(unit)
 
-    # return all the info
-    return [get_plugin_info(world, p, False) for p in plugins]
+    return groups
 
 # ------------------------------------------------------------------------------------------------------------
+# main
+
+# warnings that are too common to be useful when linting, unless asked for
+LINT_IGNORED_WARNINGS = (
+    'plugin brand is missing',
+    'plugin label is missing',
+    'no modgui available',
+)
+
+def _get_lint_warnings(warnings):
+    return [warn for warn in warnings if warn not in LINT_IGNORED_WARNINGS and "has no short name" not in warn]
+
+# Write @a items as a single JSON list, or one JSON object per line as soon as each is ready
+def _write_items(items, format, out):
+    if format == "ndjson":
+        for item in items:
+            out.write(json.dumps(item) + "\n")
+            out.flush()
+        return
+
+    out.write(json.dumps(list(items)) + "\n")
+
+def _write_timings(instrument, count, out):
+    slowest = instrument.slowest_bundles(count)
+
+    if len(slowest) == 0:
+        out.write("timings: no bundles were scanned\n")
+        return
+
+    out.write("timings: %i slowest bundles\n" % len(slowest))
+    for bundle, took in slowest:
+        out.write("%10.3f ms  %s\n" % (took * 1000.0, bundle))
+
+# Scan the plugins of bundles given on the command line, or of all bundles in the LV2 path
+def _main_plugins(args, lint):
+    from lilvlib.cache import PluginInfoCache
+    from lilvlib.index import get_lv2_bundles
+    from sys import stderr, stdout
+
+    bundles    = args.bundles or get_lv2_bundles()
+    cache      = PluginInfoCache(args.cache) if args.cache else None
+    instrument = ScanInstrument(False) if args.timings else None
+
+    if len(bundles) == 0:
+        raise Exception('main() - no bundles found')
+
+    infos = iter_plugins_info(bundles, cache, None, args.jobs, None, instrument, args.presets, lint or args.validate)
+
+    if args.format == "json":
+        infos = sorted(infos, key=lambda info: info['uri'])
+
+    failed = []
+
+    def lint_infos(infos):
+        for info in infos:
+            warnings = info['warnings'] if args.all_warnings else _get_lint_warnings(info['warnings'])
+
+            if len(info['errors']) != 0:
+                failed.append(info['uri'])
+
+            if len(info['errors']) != 0 or len(warnings) != 0:
+                yield {
+                    'uri'     : info['uri'],
+                    'errors'  : info['errors'],
+                    'warnings': warnings,
+                }
+
+    _write_items(lint_infos(infos) if lint else infos, args.format, stdout)
+
+    if instrument is not None:
+        _write_timings(instrument, args.timings, stderr)
+
+    if len(failed) != 0:
+        stderr.write("%i plugins have errors\n" % len(failed))
+        return 1
+
+    return 0
+
+# Get the info of all pedalboards inside the directories given on the command line
+def _main_pedalboards(args):
+    from sys import stderr, stdout
+
+    manager = WorldManager()
+    failed  = []
+
+    def pedalboards():
+        for rootdir in args.dirs:
+            for bundle, info, error in iter_pedalboards_info(rootdir, manager):
+                if error is not None:
+                    failed.append(bundle)
+                    stderr.write("%s: %s\n" % (bundle, error))
+                    continue
+                info['bundle'] = bundle
+                yield info
+
+    _write_items(pedalboards(), args.format, stdout)
+
+    return 1 if len(failed) != 0 else 0
+
+# Command line entry point, returns the exit code
+# Usage: lilvlib scan|lint [options] [bundles...]
+#        lilvlib pedalboards [options] dirs...
+def main(argv = None):
+    import argparse
+    from sys import stderr
+
+    def add_format(parser):
+        parser.add_argument("--format", choices=("json", "ndjson"), default="json",
+                            help="a single JSON list, or one JSON object per line as soon as each is ready")
+
+    def add_scan(parser):
+        parser.add_argument("bundles", nargs="*", help="bundles to scan (default: all bundles in LV2_PATH)")
+        parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes")
+        parser.add_argument("--cache", default=None, metavar="FILE", help="reuse results of unchanged bundles")
+        parser.add_argument("--presets", choices=PRESETS_MODES, default="full")
+        parser.add_argument("--timings", type=int, nargs="?", const=10, default=None, metavar="N",
+                            help="list the N slowest bundles on stderr (default: 10)")
+        add_format(parser)
+
+    parser = argparse.ArgumentParser(prog="lilvlib", description="Extract LV2 plugin and pedalboard data")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    scan = commands.add_parser("scan", help="get the info of plugins")
+    scan.add_argument("--no-validate", dest="validate", action="store_false",
+                      help="skip errors, warnings and file checks")
+    add_scan(scan)
+
+    lint = commands.add_parser("lint", help="list plugin errors and warnings, fails if there are errors")
+    lint.add_argument("--all-warnings", action="store_true", help="include the most common warnings")
+    add_scan(lint)
+
+    pedalboards = commands.add_parser("pedalboards", help="get the info of pedalboards")
+    pedalboards.add_argument("dirs", nargs="+", help="directories with pedalboard bundles")
+    add_format(pedalboards)
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "pedalboards":
+            return _main_pedalboards(args)
+        return _main_plugins(args, args.command == "lint")
+
+    except Exception as e:
+        stderr.write("%s\n" % e)
+        return 1
 
 if __name__ == '__main__':
-    from sys import argv, exit
-    from pprint import pprint
-    #get_plugins_info(argv[1:])
-    #for i in get_plugins_info(argv[1:]): pprint(i)
-    #exit(0)
-    for i in get_plugins_info(argv[1:]):
-        warnings = i['warnings'].copy()
-
-        if 'plugin brand is missing' in warnings:
-            i['warnings'].remove('plugin brand is missing')
-
-        if 'plugin label is missing' in warnings:
-            i['warnings'].remove('plugin label is missing')
-
-        if 'no modgui available' in warnings:
-            i['warnings'].remove('no modgui available')
-
-        for warn in warnings:
-            if "has no short name" in warn:
-                i['warnings'].remove(warn)
-
-        pprint({
-            'uri'     : i['uri'],
-            'errors'  : i['errors'],
-            'warnings': i['warnings']
-        }, width=200)
+    from sys import exit
+    exit(main())
 
 # ------------------------------------------------------------------------------------------------------------
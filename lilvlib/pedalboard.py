@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import os
+
+from lilvlib.ttl import NS_RDFS, RDF_TYPE, Literal, TtlError, XSD_INTEGER, node_as_string, parse_ttl_file, uri_to_path
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+NS_DOAP     = "http://usefulinc.com/ns/doap#"
+NS_MODPEDAL = "http://moddevices.com/ns/modpedal#"
+
+MODPEDAL_PEDALBOARD = NS_MODPEDAL + "Pedalboard"
+
+# ------------------------------------------------------------------------------------------------------------
+# get_pedalboard_summary
+
+# Get the basic info of a pedalboard (name, uri, size, screenshot and thumbnail) without lilv
+# Only the manifest and the main pedalboard TTL are read.
+# Raises TtlError if the bundle is malformed or does not contain the data we need, use lilv in that case.
+# @a bundle is a string, consisting of a directory in the filesystem (absolute pathname).
+def get_pedalboard_summary(bundle):
+    # find the pedalboard and the file it is described in
+    pedalboards = []
+    seealso     = {}
+
+    for subj, pred, obj in parse_ttl_file(os.path.join(bundle, "manifest.ttl")):
+        if pred == RDF_TYPE and obj == MODPEDAL_PEDALBOARD:
+            if subj not in pedalboards:
+                pedalboards.append(subj)
+        elif pred == NS_RDFS + "seeAlso" and not isinstance(obj, Literal):
+            seealso.setdefault(subj, []).append(obj)
+
+    if len(pedalboards) != 1:
+        raise TtlError("bundle has 0 or > 1 pedalboard")
+
+    uri  = pedalboards[0]
+    data = {}
+
+    for filename in seealso.get(uri, []):
+        if not filename.startswith("file://"):
+            raise TtlError("pedalboard data is not a local file")
+
+        for subj, pred, obj in parse_ttl_file(uri_to_path(filename)):
+            if subj != uri:
+                continue
+            # keep only the first value, untranslated names first
+            if pred in data and not (isinstance(data[pred], Literal) and data[pred].lang):
+                continue
+            data[pred] = obj
+
+    name   = data.get(NS_DOAP + "name", None)
+    width  = data.get(NS_MODPEDAL + "width", None)
+    height = data.get(NS_MODPEDAL + "height", None)
+
+    if not isinstance(name, Literal):
+        raise TtlError("pedalboard has no name")
+
+    for size in (width, height):
+        if not isinstance(size, Literal) or size.datatype != XSD_INTEGER:
+            raise TtlError("pedalboard has invalid size")
+
+    screenshot = data.get(NS_MODPEDAL + "screenshot", None)
+    thumbnail  = data.get(NS_MODPEDAL + "thumbnail", None)
+
+    return {
+        'name': name.value,
+        'uri' : uri,
+        'size': {
+            'width' : int(width.value),
+            'height': int(height.value),
+        },
+        'screenshot': os.path.basename(node_as_string(screenshot)) if screenshot is not None else "",
+        'thumbnail' : os.path.basename(node_as_string(thumbnail)) if thumbnail is not None else "",
+    }
+
+# ------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+# Built-in LV2 units, as short uri -> (label, render, symbol)
+PORT_UNITS = {
+    's'            : ("seconds", "%f s", "s"),
+    'ms'           : ("milliseconds", "%f ms", "ms"),
+    'min'          : ("minutes", "%f mins", "min"),
+    'bar'          : ("bars", "%f bars", "bars"),
+    'beat'         : ("beats", "%f beats", "beats"),
+    'frame'        : ("audio frames", "%f frames", "frames"),
+    'm'            : ("metres", "%f m", "m"),
+    'cm'           : ("centimetres", "%f cm", "cm"),
+    'mm'           : ("millimetres", "%f mm", "mm"),
+    'km'           : ("kilometres", "%f km", "km"),
+    'inch'         : ("inches", """%f\"""", "in"),
+    'mile'         : ("miles", "%f mi", "mi"),
+    'db'           : ("decibels", "%f dB", "dB"),
+    'pc'           : ("percent", "%f%%", "%"),
+    'coef'         : ("coefficient", "* %f", "*"),
+    'hz'           : ("hertz", "%f Hz", "Hz"),
+    'khz'          : ("kilohertz", "%f kHz", "kHz"),
+    'mhz'          : ("megahertz", "%f MHz", "MHz"),
+    'bpm'          : ("beats per minute", "%f BPM", "BPM"),
+    'oct'          : ("octaves", "%f octaves", "oct"),
+    'cent'         : ("cents", "%f ct", "ct"),
+    'semitone12TET': ("semitones", "%f semi", "semi"),
+    'degree'       : ("degrees", "%f deg", "deg"),
+    'midiNote'     : ("MIDI note", "MIDI note %d", "note"),
+}
+
+# ------------------------------------------------------------------------------------------------------------
+# port name and unit helpers
+
+def is_integer(string):
+    return string.strip().lstrip("-+").isdigit()
+
+def get_short_port_name(portName):
+    if len(portName) <= 16:
+        return portName
+
+    portName = portName.split("/",1)[0].split(" (",1)[0].split(" [",1)[0].strip()
+
+    # cut stuff if too big
+    if len(portName) > 16:
+        portName = portName[0] + portName[1:].replace("a","").replace("e","").replace("i","").replace("o","").replace("u","")
+
+        if len(portName) > 16:
+            portName = portName[:16]
+
+    return portName.strip()
+
+# Get the (label, render, symbol) of a built-in LV2 unit, all empty if unknown
+# @a miniuri is the unit uri without the units namespace, as in "db".
+def get_port_unit(miniuri):
+    return PORT_UNITS.get(miniuri, ("","",""))
+
+# ------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import mmap
+import os
+import struct
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+SNAPSHOT_MAGIC   = b"LVLS"
+SNAPSHOT_VERSION = 2
+
+# File layout, all numbers little endian:
+#   header  : magic, version, plugin count, string count, shape count, strings offset, shapes offset, index offset
+#   plugins : one section per plugin, each a single encoded value (see below)
+#   strings : string count offsets (u32, relative to the first string), then the utf-8 data of all strings
+#   shapes  : per shape, key count (u32) and the string id of each key (u32)
+#   index   : per plugin, uri string id (u32), section offset (u64) and section size (u32)
+#
+# Sections are flat, so each one is read with a few struct calls and only walked in python afterwards:
+#   token count, int count, float count (u32), then all tokens (u32), ints (i64) and floats (f64)
+# Each value is a token, with its type in the lowest 3 bits and a number in the rest:
+#   None, False, True : nothing
+#   int               : index in the ints of the section
+#   float             : index in the floats of the section
+#   string            : string id
+#   list              : item count, followed by the items
+#   dict              : shape id, followed by the value of each key of the shape
+# Shapes are the keys of a dict in order; dicts with the same keys (like all ports) share a single shape.
+_HEADER  = struct.Struct("<4sHxxIIIQQQ")
+_INDEX   = struct.Struct("<IQI")
+_SECTION = struct.Struct("<III")
+_U32     = struct.Struct("<I")
+
+_NONE   = 0
+_FALSE  = 1
+_TRUE   = 2
+_INT    = 3
+_FLOAT  = 4
+_STRING = 5
+_LIST   = 6
+_DICT   = 7
+
+_TAG_BITS = 3
+_TAG_MASK = (1 << _TAG_BITS) - 1
+
+# largest number a token can hold
+_MAX_TOKEN_VALUE = (1 << (32 - _TAG_BITS)) - 1
+
+# ------------------------------------------------------------------------------------------------------------
+# SnapshotError
+
+class SnapshotError(Exception):
+    pass
+
+# ------------------------------------------------------------------------------------------------------------
+# write_snapshot
+
+# Write the info of many plugins (as from get_plugins_info) into a snapshot file
+# Repeated strings (keys, port properties, units, categories, etc) and dict keys are only stored once.
+def write_snapshot(filename, plugins):
+    strings   = []
+    stringids = {}
+    shapes    = []
+    shapeids  = {}
+
+    def get_string_id(string):
+        try:
+            return stringids[string]
+        except KeyError:
+            stringids[string] = len(strings)
+            strings.append(string)
+            return stringids[string]
+
+    def get_shape_id(keys):
+        keys = tuple(get_string_id(key) for key in keys)
+        try:
+            return shapeids[keys]
+        except KeyError:
+            shapeids[keys] = len(shapes)
+            shapes.append(keys)
+            return shapeids[keys]
+
+    def token(tag, number):
+        if number > _MAX_TOKEN_VALUE:
+            raise SnapshotError("write_snapshot() - too many values")
+        return (number << _TAG_BITS) | tag
+
+    def encode(value, tokens, ints, floats):
+        if value is None:
+            tokens.append(_NONE)
+        elif value is False:
+            tokens.append(_FALSE)
+        elif value is True:
+            tokens.append(_TRUE)
+        elif isinstance(value, int):
+            tokens.append(token(_INT, len(ints)))
+            ints.append(value)
+        elif isinstance(value, float):
+            tokens.append(token(_FLOAT, len(floats)))
+            floats.append(value)
+        elif isinstance(value, str):
+            tokens.append(token(_STRING, get_string_id(value)))
+        elif isinstance(value, (list, tuple)):
+            tokens.append(token(_LIST, len(value)))
+            for item in value:
+                encode(item, tokens, ints, floats)
+        elif isinstance(value, dict):
+            tokens.append(token(_DICT, get_shape_id(value.keys())))
+            for item in value.values():
+                encode(item, tokens, ints, floats)
+        else:
+            raise SnapshotError("write_snapshot() - unsupported value type '%s'" % type(value).__name__)
+
+    dirname = os.path.dirname(os.path.abspath(filename))
+    if not os.path.exists(dirname):
+        os.makedirs(dirname)
+
+    # write to a temporary file first, so an interrupted write never leaves a broken snapshot behind
+    tmpfile = "%s.tmp%i" % (filename, os.getpid())
+
+    with open(tmpfile, 'wb') as fd:
+        fd.write(b"\0" * _HEADER.size)
+
+        index  = []
+        offset = _HEADER.size
+
+        for info in plugins:
+            tokens = []
+            ints   = []
+            floats = []
+            encode(info, tokens, ints, floats)
+
+            try:
+                data = struct.pack("<III%iI%iq%id" % (len(tokens), len(ints), len(floats)),
+                                   len(tokens), len(ints), len(floats), *(tokens + ints + floats))
+            except struct.error as e:
+                raise SnapshotError("write_snapshot() - %s" % e)
+
+            fd.write(data)
+            index.append((get_string_id(info['uri']), offset, len(data)))
+            offset += len(data)
+
+        # strings
+        stroffset = offset
+        encoded   = [string.encode("utf-8", "surrogatepass") for string in strings]
+        position  = 0
+        offsets   = []
+
+        for data in encoded:
+            offsets.append(position)
+            position += len(data)
+
+        # one extra offset, so the size of each string is known
+        offsets.append(position)
+
+        fd.write(struct.pack("<%iI" % len(offsets), *offsets))
+        fd.write(b"".join(encoded))
+
+        # shapes
+        shapeoffset = stroffset + 4 * len(offsets) + position
+        shapesize   = 0
+
+        for keys in shapes:
+            fd.write(struct.pack("<I%iI" % len(keys), len(keys), *keys))
+            shapesize += 4 * (len(keys) + 1)
+
+        # index
+        idxoffset = shapeoffset + shapesize
+
+        for entry in index:
+            fd.write(_INDEX.pack(*entry))
+
+        fd.seek(0)
+        fd.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(index), len(strings), len(shapes),
+                              stroffset, shapeoffset, idxoffset))
+
+    os.replace(tmpfile, filename)
+
+# ------------------------------------------------------------------------------------------------------------
+# CatalogSnapshot
+
+# Read access to a snapshot file
+# Only the header and the index are read when opening, each plugin is decoded when requested. This is meant for
+# hosts that start up with the catalog index and look up plugins as needed (for example the ones in the current
+# pedalboard): there is no way to load everything at once, as that is faster with a JSON dump of the same data.
+# Raises SnapshotError if the file is not a snapshot or uses another version.
+class CatalogSnapshot(object):
+    def __init__(self, filename):
+        self.filename = filename
+
+        with open(filename, 'rb') as fd:
+            try:
+                self._data = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty file
+                self._data = b""
+
+        if len(self._data) < _HEADER.size:
+            self.close()
+            raise SnapshotError("CatalogSnapshot(%s) - file is too small" % filename)
+
+        magic, version, count, strcount, shapecount, stroffset, shapeoffset, idxoffset = \
+            _HEADER.unpack_from(self._data, 0)
+
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise SnapshotError("CatalogSnapshot(%s) - not a snapshot file" % filename)
+
+        if version != SNAPSHOT_VERSION:
+            self.close()
+            raise SnapshotError("CatalogSnapshot(%s) - unsupported version %i" % (filename, version))
+
+        if idxoffset + count * _INDEX.size > len(self._data) or stroffset + 4 * (strcount + 1) > shapeoffset or \
+           shapeoffset + 4 * shapecount > idxoffset:
+            self.close()
+            raise SnapshotError("CatalogSnapshot(%s) - file is truncated" % filename)
+
+        # strings and shape keys are decoded on first use
+        self._stroffsets = struct.unpack_from("<%iI" % (strcount + 1), self._data, stroffset)
+        self._strdata    = stroffset + 4 * (strcount + 1)
+        self._strings    = [None] * strcount
+        self._shapes     = [None] * shapecount
+
+        # shape id -> offset of its key count
+        self._shapeoffsets = []
+        offset = shapeoffset
+
+        for i in range(shapecount):
+            self._shapeoffsets.append(offset)
+            offset += 4 * (_U32.unpack_from(self._data, offset)[0] + 1)
+
+            if offset > idxoffset:
+                self.close()
+                raise SnapshotError("CatalogSnapshot(%s) - file is truncated" % filename)
+
+        # uri -> (offset, size), in the order plugins were written
+        self._index = {}
+        self._uris  = []
+
+        for i in range(count):
+            uriid, offset, size = _INDEX.unpack_from(self._data, idxoffset + i * _INDEX.size)
+            uri = self._get_string(uriid)
+            self._index[uri] = (offset, size)
+            self._uris.append(uri)
+
+    def __len__(self):
+        return len(self._uris)
+
+    def __contains__(self, uri):
+        return uri in self._index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b""
+
+    # Get the uris of all plugins, in the order they were written
+    def uris(self):
+        return list(self._uris)
+
+    # Get the info of a single plugin, or None if unknown
+    def get(self, uri):
+        entry = self._index.get(uri, None)
+
+        if entry is None:
+            return None
+
+        return self._decode(entry[0])
+
+    def _get_string(self, stringid):
+        string = self._strings[stringid]
+
+        if string is None:
+            start  = self._strdata + self._stroffsets[stringid]
+            end    = self._strdata + self._stroffsets[stringid + 1]
+            string = self._strings[stringid] = self._data[start:end].decode("utf-8", "surrogatepass")
+
+        return string
+
+    # Get the keys of a shape, as a tuple of strings
+    def _get_shape(self, shapeid):
+        keys = self._shapes[shapeid]
+
+        if keys is None:
+            offset = self._shapeoffsets[shapeid]
+            count  = _U32.unpack_from(self._data, offset)[0]
+            keyids = struct.unpack_from("<%iI" % count, self._data, offset + 4)
+            keys   = self._shapes[shapeid] = tuple(self._get_string(keyid) for keyid in keyids)
+
+        return keys
+
+    def _decode(self, offset):
+        data = self._data
+
+        try:
+            tokencount, intcount, floatcount = _SECTION.unpack_from(data, offset)
+            start  = offset + _SECTION.size
+            tokens = struct.unpack_from("<%iI" % tokencount, data, start)
+            start += 4 * tokencount
+            ints   = struct.unpack_from("<%iq" % intcount, data, start)
+            start += 8 * intcount
+            floats = struct.unpack_from("<%id" % floatcount, data, start)
+        except struct.error:
+            raise SnapshotError("CatalogSnapshot(%s) - invalid data at offset %i" % (self.filename, offset))
+
+        strings = self._strings
+        shapes  = self._shapes
+
+        # make sure everything this section uses is decoded, so the loop below only needs plain lookups
+        try:
+            for token in tokens:
+                tag = token & _TAG_MASK
+                if tag == _STRING:
+                    if strings[token >> _TAG_BITS] is None:
+                        self._get_string(token >> _TAG_BITS)
+                elif tag == _DICT:
+                    if shapes[token >> _TAG_BITS] is None:
+                        self._get_shape(token >> _TAG_BITS)
+        except (IndexError, struct.error):
+            raise SnapshotError("CatalogSnapshot(%s) - invalid data at offset %i" % (self.filename, offset))
+
+        next_token = iter(tokens).__next__
+        constants  = (None, False, True)
+
+        def decode(token):
+            tag = token & _TAG_MASK
+
+            if tag == _DICT or tag == _LIST:
+                if tag == _DICT:
+                    keys  = shapes[token >> _TAG_BITS]
+                    count = len(keys)
+                else:
+                    keys  = None
+                    count = token >> _TAG_BITS
+
+                items = []
+                add   = items.append
+
+                # plain values are handled right here, only containers go through another call
+                for i in range(count):
+                    token = next_token()
+                    tag   = token & _TAG_MASK
+
+                    if tag == _STRING:
+                        add(strings[token >> _TAG_BITS])
+                    elif tag == _DICT or tag == _LIST:
+                        add(decode(token))
+                    elif tag == _INT:
+                        add(ints[token >> _TAG_BITS])
+                    elif tag == _FLOAT:
+                        add(floats[token >> _TAG_BITS])
+                    elif token < 3:
+                        add(constants[token])
+                    else:
+                        raise SnapshotError("CatalogSnapshot(%s) - invalid data at offset %i" % (self.filename,
+                                                                                                  offset))
+
+                return items if keys is None else dict(zip(keys, items))
+
+            if tag == _STRING:
+                return strings[token >> _TAG_BITS]
+            if tag == _INT:
+                return ints[token >> _TAG_BITS]
+            if tag == _FLOAT:
+                return floats[token >> _TAG_BITS]
+            if token < 3:
+                return constants[token]
+
+            raise SnapshotError("CatalogSnapshot(%s) - invalid data at offset %i" % (self.filename, offset))
+
+        try:
+            return decode(next_token())
+        except (IndexError, StopIteration):
+            raise SnapshotError("CatalogSnapshot(%s) - invalid data at offset %i" % (self.filename, offset))
+
+# ------------------------------------------------------------------------------------------------------------
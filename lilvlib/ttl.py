@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import os
+import re
+
+from urllib.parse import quote, unquote, urljoin
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+NS_RDF  = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+NS_RDFS = "http://www.w3.org/2000/01/rdf-schema#"
+NS_XSD  = "http://www.w3.org/2001/XMLSchema#"
+
+RDF_TYPE  = NS_RDF + "type"
+RDF_FIRST = NS_RDF + "first"
+RDF_REST  = NS_RDF + "rest"
+RDF_NIL   = NS_RDF + "nil"
+
+XSD_BOOLEAN = NS_XSD + "boolean"
+XSD_DECIMAL = NS_XSD + "decimal"
+XSD_DOUBLE  = NS_XSD + "double"
+XSD_INTEGER = NS_XSD + "integer"
+
+# ------------------------------------------------------------------------------------------------------------
+# Nodes
+
+# URIs are plain strings, blank nodes and literals use the classes below
+
+class BlankNode(str):
+    __slots__ = ()
+
+    def __repr__(self):
+        return "_:%s" % str(self)
+
+class Literal(object):
+    __slots__ = ("value", "datatype", "lang")
+
+    def __init__(self, value, datatype = None, lang = None):
+        self.value    = value
+        self.datatype = datatype
+        self.lang     = lang
+
+    def __eq__(self, other):
+        return isinstance(other, Literal) and (self.value, self.datatype, self.lang) == (other.value,
+                                                                                          other.datatype,
+                                                                                          other.lang)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.value, self.datatype, self.lang))
+
+    def __repr__(self):
+        if self.lang:
+            return '"%s"@%s' % (self.value, self.lang)
+        if self.datatype:
+            return '"%s"^^<%s>' % (self.value, self.datatype)
+        return '"%s"' % self.value
+
+class TtlError(Exception):
+    pass
+
+# ------------------------------------------------------------------------------------------------------------
+# Utilities
+
+# Convert a filesystem path into a file uri, escaped the same way lilv does it
+def path_to_uri(path):
+    uri = "file://" + quote(os.path.abspath(path), safe="!$&'()*+,-./:;=@_~")
+    if path.endswith(os.sep):
+        uri += "/"
+    return uri
+
+# Convert a file uri back into a filesystem path
+def uri_to_path(uri):
+    if uri.startswith("file://"):
+        uri = uri[7:]
+    return unquote(uri.split("#",1)[0])
+
+# Get the string value of a node, no matter its type
+def node_as_string(node):
+    if isinstance(node, Literal):
+        return node.value
+    return str(node)
+
+# ------------------------------------------------------------------------------------------------------------
+# Tokenizer
+
+_TOKENS = re.compile(r'''
+    (?P<ws>      (?:\s+|\#[^\n]*)+ )
+  | (?P<iri>     <[^<>"{}|^`\\\x00-\x20]*> )
+  | (?P<string3> """(?:[^"\\]|\\.|"(?!""))*"""|\'\'\'(?:[^'\\]|\\.|'(?!''))*\'\'\' )
+  | (?P<string>  "(?:[^"\\\n\r]|\\.)*"|'(?:[^'\\\n\r]|\\.)*' )
+  | (?P<directive> @(?:prefix|base)\b )
+  | (?P<lang>    @[a-zA-Z]+(?:-[a-zA-Z0-9]+)* )
+  | (?P<dtype>   \^\^ )
+  | (?P<number>  [+-]?(?:\d+\.\d*[eE][+-]?\d+|\.\d+[eE][+-]?\d+|\d+[eE][+-]?\d+|\d*\.\d+|\d+) )
+  | (?P<blank>   _:[\w-]+(?:\.+[\w-]+)* )
+  | (?P<pname>   (?:[A-Za-z][\w-]*(?:\.+[\w-]+)*)?:(?:[\w\-:%]|\\.)*(?:\.+(?:[\w\-:%]|\\.)+)* )
+  | (?P<word>    [A-Za-z][\w-]* )
+  | (?P<punct>   [;,.\[\]()] )
+''', re.VERBOSE)
+
+_ESCAPES = {
+    't': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\',
+}
+
+_ESCAPES_RE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))', re.DOTALL)
+
+def _unescape_match(match):
+    if match.group(1) or match.group(2):
+        return chr(int(match.group(1) or match.group(2), 16))
+    return _ESCAPES.get(match.group(3), match.group(3))
+
+def _unescape(string):
+    if "\\" not in string:
+        return string
+    return _ESCAPES_RE.sub(_unescape_match, string)
+
+def _tokenize(data):
+    pos  = 0
+    size = len(data)
+
+    while pos < size:
+        match = _TOKENS.match(data, pos)
+
+        if match is None:
+            raise TtlError("invalid syntax at offset %i: %r" % (pos, data[pos:pos+20]))
+
+        pos  = match.end()
+        kind = match.lastgroup
+
+        if kind == "ws":
+            continue
+
+        yield (kind, match.group(kind))
+
+    yield (None, None)
+
+# ------------------------------------------------------------------------------------------------------------
+# Parser
+
+class _Parser(object):
+    def __init__(self, data, base):
+        self.tokens   = _tokenize(data)
+        self.base     = base
+        self.prefixes = {}
+        self.blanks   = {}
+        self.nblanks  = 0
+        self.triples  = []
+        self.next()
+
+    def next(self):
+        self.kind, self.value = next(self.tokens)
+
+    def expect(self, value):
+        if self.value != value or self.kind not in ("punct", "word"):
+            raise TtlError("expected '%s', got '%s'" % (value, self.value))
+        self.next()
+
+    def new_blank(self):
+        self.nblanks += 1
+        return BlankNode("b%i" % self.nblanks)
+
+    def resolve(self, iri):
+        iri = _unescape(iri)
+        if not self.base or ":" in iri.split("/", 1)[0]:
+            return iri
+        return urljoin(self.base, iri)
+
+    # parse a full document, returns a list of triples per statement
+    def statements(self):
+        while self.kind is not None:
+            if self.kind == "directive" or (self.kind == "word" and self.value.lower() in ("prefix", "base")):
+                self.directive()
+                continue
+
+            self.triples = []
+            self.statement()
+            yield self.triples
+
+    def directive(self):
+        sparql = self.kind == "word"
+        name   = self.value.lower().lstrip("@")
+        self.next()
+
+        if name == "prefix":
+            if self.kind != "pname":
+                raise TtlError("invalid prefix name '%s'" % self.value)
+            prefix = self.value[:-1]
+            self.next()
+            if self.kind != "iri":
+                raise TtlError("invalid prefix iri '%s'" % self.value)
+            self.prefixes[prefix] = self.resolve(self.value[1:-1])
+            self.next()
+        else:
+            if self.kind != "iri":
+                raise TtlError("invalid base iri '%s'" % self.value)
+            self.base = self.resolve(self.value[1:-1])
+            self.next()
+
+        if not sparql:
+            self.expect(".")
+
+    def statement(self):
+        if self.kind == "punct" and self.value == "[":
+            subject = self.blank_property_list()
+            if not (self.kind == "punct" and self.value == "."):
+                self.predicate_object_list(subject)
+        else:
+            subject = self.subject()
+            self.predicate_object_list(subject)
+
+        self.expect(".")
+
+    def subject(self):
+        if self.kind == "punct" and self.value == "(":
+            return self.collection()
+        return self.resource()
+
+    def resource(self):
+        kind, value = self.kind, self.value
+
+        if kind == "iri":
+            self.next()
+            return self.resolve(value[1:-1])
+
+        if kind == "pname":
+            self.next()
+            prefix, local = value.split(":", 1)
+            if prefix not in self.prefixes:
+                raise TtlError("undefined prefix '%s'" % prefix)
+            return self.prefixes[prefix] + _unescape(local)
+
+        if kind == "blank":
+            self.next()
+            label = value[2:]
+            if label not in self.blanks:
+                self.blanks[label] = self.new_blank()
+            return self.blanks[label]
+
+        raise TtlError("expected a resource, got '%s'" % value)
+
+    def predicate_object_list(self, subject):
+        while True:
+            if self.kind == "word" and self.value == "a":
+                self.next()
+                predicate = RDF_TYPE
+            else:
+                predicate = self.resource()
+
+            self.object_list(subject, predicate)
+
+            if not (self.kind == "punct" and self.value == ";"):
+                break
+
+            # allow repeated and trailing ';'
+            while self.kind == "punct" and self.value == ";":
+                self.next()
+
+            if self.kind == "punct" and self.value in (".", "]"):
+                break
+
+    def object_list(self, subject, predicate):
+        while True:
+            self.triples.append((subject, predicate, self.object()))
+
+            if not (self.kind == "punct" and self.value == ","):
+                break
+
+            self.next()
+
+    def object(self):
+        kind, value = self.kind, self.value
+
+        if kind == "punct" and value == "[":
+            return self.blank_property_list()
+
+        if kind == "punct" and value == "(":
+            return self.collection()
+
+        if kind in ("string", "string3"):
+            self.next()
+            quote = 3 if kind == "string3" else 1
+            value = _unescape(value[quote:-quote])
+
+            if self.kind == "lang":
+                lang = self.value[1:]
+                self.next()
+                return Literal(value, None, lang)
+
+            if self.kind == "dtype":
+                self.next()
+                return Literal(value, self.resource())
+
+            return Literal(value)
+
+        if kind == "number":
+            self.next()
+            if "e" in value or "E" in value:
+                return Literal(value, XSD_DOUBLE)
+            if "." in value:
+                return Literal(value, XSD_DECIMAL)
+            return Literal(value, XSD_INTEGER)
+
+        if kind == "word" and value in ("true", "false"):
+            self.next()
+            return Literal(value, XSD_BOOLEAN)
+
+        return self.resource()
+
+    def blank_property_list(self):
+        self.expect("[")
+        node = self.new_blank()
+
+        if not (self.kind == "punct" and self.value == "]"):
+            self.predicate_object_list(node)
+
+        self.expect("]")
+        return node
+
+    def collection(self):
+        self.expect("(")
+
+        head = RDF_NIL
+        prev = None
+
+        while not (self.kind == "punct" and self.value == ")"):
+            if self.kind is None:
+                raise TtlError("unterminated collection")
+
+            node = self.new_blank()
+
+            if prev is None:
+                head = node
+            else:
+                self.triples.append((prev, RDF_REST, node))
+
+            self.triples.append((node, RDF_FIRST, self.object()))
+            prev = node
+
+        if prev is not None:
+            self.triples.append((prev, RDF_REST, RDF_NIL))
+
+        self.expect(")")
+        return head
+
+# ------------------------------------------------------------------------------------------------------------
+# parse_ttl_string
+
+# Parse turtle data, yielding (subject, predicate, object) triples one statement at a time
+# Relative iris are resolved against @a base.
+def parse_ttl_string(data, base = None):
+    parser = _Parser(data, base)
+
+    for triples in parser.statements():
+        for triple in triples:
+            yield triple
+
+# ------------------------------------------------------------------------------------------------------------
+# parse_ttl_file
+
+# Parse a turtle file, yielding (subject, predicate, object) triples one statement at a time
+# Raises TtlError on invalid data.
+def parse_ttl_file(filename):
+    try:
+        with open(filename, 'r', encoding="utf-8") as fd:
+            data = fd.read()
+    except (IOError, UnicodeDecodeError) as e:
+        raise TtlError(str(e))
+
+    return parse_ttl_string(data, path_to_uri(filename))
+
+# ------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------------------------------------
+# Imports
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from lilvlib.cache import get_bundle_fingerprint
+from lilvlib.category import CategoryIndex
+from lilvlib.index import get_lv2_bundles, get_lv2_path, get_manifest_plugins
+from lilvlib.lilvlib import WorldManager, get_bundle_path, get_plugin_info
+
+# ------------------------------------------------------------------------------------------------------------
+# Constants
+
+# from sys/inotify.h
+IN_MODIFY      = 0x00000002
+IN_ATTRIB      = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM  = 0x00000040
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF   = 0x00000800
+IN_Q_OVERFLOW  = 0x00004000
+IN_IGNORED     = 0x00008000
+IN_ISDIR       = 0x40000000
+
+IN_LV2DIR_MASK = IN_CREATE|IN_DELETE|IN_MOVED_FROM|IN_MOVED_TO|IN_DELETE_SELF|IN_MOVE_SELF
+IN_BUNDLE_MASK = IN_CLOSE_WRITE|IN_CREATE|IN_DELETE|IN_MOVED_FROM|IN_MOVED_TO|IN_ATTRIB
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# ------------------------------------------------------------------------------------------------------------
+# Inotify
+
+# Minimal inotify binding, linux only
+class Inotify(object):
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._add_watch.restype  = ctypes.c_int
+
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        self._rm_watch.restype  = ctypes.c_int
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path, mask):
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+
+        return wd
+
+    def rm_watch(self, wd):
+        self._rm_watch(self.fd, wd)
+
+    # Read pending events, waiting up to @a timeout seconds for them
+    # Returns a list of (wd, mask, name).
+    def read(self, timeout = None):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, size = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name    = os.fsdecode(data[offset:offset+size].rstrip(b"\0"))
+            offset += size
+            events.append((wd, mask, name))
+
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+# ------------------------------------------------------------------------------------------------------------
+# BundleWatcher
+
+# Watch LV2 directories for added, removed or modified bundles
+# Uses inotify on Linux, otherwise (or if inotify fails) it simply polls.
+class BundleWatcher(object):
+    def __init__(self, paths = None, settle = 0.5, interval = 2.0, polling = None):
+        self.paths    = [os.path.abspath(path) for path in (paths if paths is not None else get_lv2_path())]
+        self.settle   = settle
+        self.interval = interval
+        self.inotify  = None
+        self.watches  = {}
+
+        if polling is None:
+            polling = not sys.platform.startswith("linux")
+
+        if not polling:
+            try:
+                self.inotify = Inotify()
+            except (AttributeError, OSError):
+                self.inotify = None
+
+        if self.inotify is not None:
+            for path in self.paths:
+                self._watch(path, None)
+                if os.path.isdir(path):
+                    for name in os.listdir(path):
+                        self._watch(os.path.join(path, name), path)
+
+    @property
+    def polling(self):
+        return self.inotify is None
+
+    # Watch a LV2 directory (@a lv2dir is None) for bundles, or a bundle for changed files
+    # Subdirectories of bundles (modgui, presets, etc) are watched too, as get_bundle_fingerprint includes them.
+    # @a bundle is the bundle a subdirectory belongs to.
+    def _watch(self, path, lv2dir, bundle = None):
+        if not os.path.isdir(path):
+            return
+        try:
+            wd = self.inotify.add_watch(path, IN_BUNDLE_MASK if lv2dir else IN_LV2DIR_MASK)
+        except OSError:
+            return
+
+        if lv2dir is None:
+            self.watches[wd] = (path, None, None)
+            return
+
+        if bundle is None:
+            bundle = path
+
+        self.watches[wd] = (path, lv2dir, bundle)
+
+        try:
+            names = os.listdir(path)
+        except OSError:
+            return
+
+        # same as os.walk in get_bundle_fingerprint, symlinks to directories are not followed
+        for name in names:
+            subdir = os.path.join(path, name)
+            if os.path.isdir(subdir) and not os.path.islink(subdir):
+                self._watch(subdir, lv2dir, bundle)
+
+    # Wait for changes
+    # Returns the set of bundle paths that might have changed, or None if anything might have changed.
+    def wait(self, timeout = None):
+        if self.inotify is None:
+            time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+            return None
+
+        events = self.inotify.read(timeout)
+
+        if len(events) == 0:
+            return set()
+
+        # wait for the installation or removal to finish
+        while True:
+            more = self.inotify.read(self.settle)
+            if len(more) == 0:
+                break
+            events += more
+
+        bundles = set()
+
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                return None
+
+            if wd not in self.watches:
+                continue
+
+            path, lv2dir, bundle = self.watches[wd]
+
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                continue
+
+            # event on a LV2 directory, the bundle is the entry itself
+            if lv2dir is None:
+                if not name:
+                    continue
+                bundle = os.path.join(path, name)
+                if mask & (IN_CREATE|IN_MOVED_TO) and mask & IN_ISDIR:
+                    self._watch(bundle, path)
+
+            # event inside a bundle, or one of its subdirectories
+            elif mask & (IN_CREATE|IN_MOVED_TO) and mask & IN_ISDIR and name:
+                self._watch(os.path.join(path, name), lv2dir, bundle)
+
+            bundles.add(get_bundle_path(bundle))
+
+        return bundles
+
+    def close(self):
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+        self.watches = {}
+
+# ------------------------------------------------------------------------------------------------------------
+# IncrementalCatalog
+
+# Plugin catalog that follows changes on disk
+# All bundles live in a persistent lilv world, on changes only the affected bundles are reloaded
+# and only the affected plugins are extracted again.
+# Changes are reported as a list of (event, uri, info) tuples, where event is 'add', 'remove' or 'update'.
+class IncrementalCatalog(object):
+    def __init__(self, paths = None, useAbsolutePath = False):
+        self.paths   = paths if paths is not None else get_lv2_path()
+        self.manager = WorldManager()
+        self.useAbsolutePath = useAbsolutePath
+
+        # uri -> info, and category bitmasks of the same plugins
+        self.plugins    = {}
+        self.categories = CategoryIndex()
+
+        # bundle -> fingerprint, and bundle -> uris of the plugins it declares or extends
+        self.fingerprints = {}
+        self.bundleuris   = {}
+
+        self.watcher = None
+
+    # Initial scan, everything is reported as added
+    def scan(self):
+        return self.update(None)
+
+    # Check for changes and apply them
+    # @a bundles is the set of bundles that might have changed, None checks all of them.
+    def update(self, bundles = None):
+        if bundles is None:
+            current = set(get_lv2_bundles(self.paths))
+            bundles = current | set(self.fingerprints.keys())
+        else:
+            current = None
+
+        removed = []
+        changed = []
+
+        for bundle in sorted(bundles):
+            exists = os.path.exists(os.path.join(bundle, "manifest.ttl")) if current is None else bundle in current
+
+            if not exists:
+                if bundle in self.fingerprints:
+                    removed.append(bundle)
+                continue
+
+            fingerprint = get_bundle_fingerprint(bundle)
+
+            if self.fingerprints.get(bundle, None) != fingerprint:
+                self.fingerprints[bundle] = fingerprint
+                changed.append(bundle)
+
+        if len(removed) == 0 and len(changed) == 0:
+            return []
+
+        # plugins that need to be extracted again
+        dirty = set()
+
+        for bundle in removed:
+            self.manager.unload_bundle(bundle)
+            del self.fingerprints[bundle]
+            dirty.update(self.bundleuris.pop(bundle, []))
+
+        for bundle in changed:
+            dirty.update(self.bundleuris.get(bundle, []))
+            self.manager.reload_bundle(bundle)
+            self.bundleuris[bundle] = get_manifest_plugins(bundle)
+            dirty.update(self.bundleuris[bundle])
+
+        # plugins as currently seen by lilv
+        # (the manifest filter skips leftovers of unloaded bundles in old lilv versions)
+        declared = set()
+        for uris in self.bundleuris.values():
+            declared.update(uris)
+
+        plugins = dict((p.get_uri().as_string(), p) for p in self.manager.get_plugins())
+
+        events = []
+
+        for uri in sorted(dirty):
+            plugin = plugins.get(uri, None) if uri in declared else None
+
+            if plugin is None:
+                if uri in self.plugins:
+                    events.append(('remove', uri, self.plugins.pop(uri)))
+                    self.categories.remove(uri)
+                continue
+
+            info = get_plugin_info(self.manager.world, plugin, self.useAbsolutePath)
+
+            if uri in self.plugins:
+                if self.plugins[uri] != info:
+                    events.append(('update', uri, info))
+            else:
+                events.append(('add', uri, info))
+
+            self.plugins[uri] = info
+            self.categories.add(info)
+
+        return events
+
+    # Get the uris of the plugins in any of @a categories, or in all of them if @a matchAll is set
+    def filter_categories(self, categories, matchAll = False):
+        return self.categories.filter(categories, matchAll)
+
+    # Watch the LV2 directories forever, yielding each list of changes
+    # @a timeout is the maximum time to wait between checks, None means forever.
+    def watch(self, timeout = None, polling = None):
+        if self.watcher is None:
+            self.watcher = BundleWatcher(self.paths, polling=polling)
+
+        if len(self.fingerprints) == 0:
+            events = self.scan()
+            if len(events) != 0:
+                yield events
+
+        while True:
+            bundles = self.watcher.wait(timeout)
+
+            if bundles is not None and len(bundles) == 0:
+                continue
+
+            events = self.update(bundles)
+
+            if len(events) != 0:
+                yield events
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+# ------------------------------------------------------------------------------------------------------------